@@ -1,14 +1,74 @@
-import pygame
+import json
+import os
+from collections import namedtuple
 
-import spriteSheet
+MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "animations.json")
 
-pygame.init()
 
-class animation():
-    def __init__(self, direction, type, loop):
-        self.direction = direction
-        self.type = type
-        self.loop = loop
-        self.animation = []
+#frames and durations are tuples so one clip can be shared by every entity
+Clip = namedtuple("Clip", ["name", "direction", "frames", "durations"])
 
-    
+
+class Cursor:
+    """Per entity playback position into a shared Clip"""
+    __slots__ = ("clip", "frame", "elapsed")
+
+    def __init__(self, clip):
+        self.clip = clip
+        self.frame = 0
+        self.elapsed = 0
+
+    def play(self, clip):
+        if clip is not self.clip:
+            #keep the beat when switching, but never index past the new clip
+            self.clip = clip
+            self.frame %= len(clip.frames)
+
+    def advance(self, dt):
+        self.elapsed += dt
+        durations = self.clip.durations
+        while self.elapsed >= durations[self.frame]:
+            self.elapsed -= durations[self.frame]
+            self.frame = (self.frame + 1) % len(durations)
+
+    def image(self):
+        return self.clip.frames[self.frame]
+
+
+class AnimationRegistry:
+    def __init__(self):
+        self.clips = {}
+
+    def add(self, name, direction, frames, durations):
+        frames = tuple(frames)
+        if isinstance(durations, (int, float)):
+            durations = (durations,) * len(frames)
+        durations = tuple(durations)
+        if len(durations) != len(frames):
+            raise ValueError(f"{name} {direction}: {len(frames)} frames but {len(durations)} durations")
+        if min(durations) <= 0:
+            raise ValueError(f"{name} {direction}: frame durations must be positive")
+
+        clip = Clip(name, direction, frames, durations)
+        self.clips[(name, direction)] = clip
+        return clip
+
+    def get(self, name, direction):
+        return self.clips[(name, direction)]
+
+    def cursor(self, name, direction):
+        return Cursor(self.get(name, direction))
+
+
+def loadRegistry(frameAtlas, path=MANIFEST):
+    """Build every clip listed in the manifest from atlas frames"""
+    with open(path) as f:
+        manifest = json.load(f)
+
+    registry = AnimationRegistry()
+    for entry in manifest:
+        row = entry.get("row", 0)
+        flip = entry.get("flip", False)
+        frames = [frameAtlas.get(entry["sheet"], x, row, flip) for x in range(entry["frames"])]
+        registry.add(entry["name"], entry["direction"], frames, entry["duration"])
+    return registry
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import math
+import os
+
+import pygame
+
+BLACK = (0, 0, 0)
+
+#every character sheet is a grid of 80x80 cells, one animation per row
+CELL = 80
+ATLAS_VERSION = 1
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+#sheet name : png in assets/
+SHEETS = {
+    "idle": "idle.png",
+    "walk": "walk.png",
+    "sprint": "sprint.png",
+    "hurt": "hurt.png",
+    "death": "death.png",
+}
+
+
+def frameKey(sheet, frame, row, flip):
+    return f"{sheet}:{row}:{frame}:{int(bool(flip))}"
+
+
+class Atlas:
+    def __init__(self, surface, index):
+        self.surface = surface
+        self.index = index
+        self.frames = {}
+
+    def get(self, sheet, frame, row=0, flip=False):
+        key = frameKey(sheet, frame, row, flip)
+        image = self.frames.get(key)
+        if image is None:
+            image = self.surface.subsurface(pygame.Rect(self.index["frames"][key]))
+            self.frames[key] = image
+        return image
+
+    def strip(self, sheet, row=0, flip=False):
+        #every frame of one row, in order
+        count = self.index["sheets"][sheet]["frames"]
+        return [self.get(sheet, x, row, flip) for x in range(count)]
+
+
+def cacheKey(assetDir, sheets, width, height, scale):
+    digest = hashlib.sha1(f"{ATLAS_VERSION}:{width}:{height}:{scale}".encode())
+    for name in sorted(sheets):
+        digest.update(name.encode())
+        with open(os.path.join(assetDir, sheets[name]), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def build(assetDir=ASSET_DIR, sheets=SHEETS, width=16, height=16, scale=4):
+    """Slice every sheet into one packed atlas, returns (surface, index)"""
+    layout = []
+    sheetInfo = {}
+    images = {}
+    for name in sorted(sheets):
+        image = pygame.image.load(os.path.join(assetDir, sheets[name]))
+        images[name] = image
+        frames = image.get_width() // CELL
+        rows = image.get_height() // CELL
+        sheetInfo[name] = {"frames": frames, "rows": rows}
+        for flip in (False, True):
+            for row in range(rows):
+                for frame in range(frames):
+                    layout.append((name, frame, row, flip))
+
+    columns = math.ceil(math.sqrt(len(layout)))
+    lines = math.ceil(len(layout) / columns)
+
+    #pack the unscaled crops first so the whole atlas is scaled in one pass
+    staging = pygame.Surface((columns * width, lines * height))
+    staging.fill(BLACK)
+    flipped = {}
+    frameRects = {}
+    for i, (name, frame, row, flip) in enumerate(layout):
+        x = (i % columns) * width
+        y = (i // columns) * height
+        if flip:
+            if name not in flipped:
+                flipped[name] = pygame.transform.flip(images[name], True, False)
+            sheetWidth = images[name].get_width()
+            area = (sheetWidth - CELL * frame - width, row * CELL, width, height)
+            staging.blit(flipped[name], (x, y), area)
+        else:
+            staging.blit(images[name], (x, y), (CELL * frame, row * CELL, width, height))
+        frameRects[frameKey(name, frame, row, flip)] = [x * scale, y * scale, width * scale, height * scale]
+
+    staging = pygame.transform.scale(staging, (columns * width * scale, lines * height * scale))
+    staging.set_colorkey(BLACK)
+
+    #bake the colorkey into real alpha so the atlas survives a png round trip
+    surface = pygame.Surface(staging.get_size(), pygame.SRCALPHA)
+    surface.blit(staging, (0, 0))
+
+    index = {
+        "version": ATLAS_VERSION,
+        "scale": scale,
+        "width": width,
+        "height": height,
+        "sheets": sheetInfo,
+        "frames": frameRects,
+    }
+    return surface, index
+
+
+def load(assetDir=ASSET_DIR, sheets=SHEETS, width=16, height=16, scale=4, cacheDir=CACHE_DIR):
+    """Load the frame atlas from the on-disk cache, building it on a miss"""
+    key = cacheKey(assetDir, sheets, width, height, scale)
+    imagePath = os.path.join(cacheDir, f"atlas-{key}.png")
+    indexPath = os.path.join(cacheDir, f"atlas-{key}.json")
+
+    surface = None
+    if os.path.exists(imagePath) and os.path.exists(indexPath):
+        try:
+            with open(indexPath) as f:
+                index = json.load(f)
+            surface = pygame.image.load(imagePath)
+        except (OSError, ValueError, pygame.error):
+            surface = None
+
+    if surface is None:
+        surface, index = build(assetDir, sheets, width, height, scale)
+        try:
+            os.makedirs(cacheDir, exist_ok=True)
+            pygame.image.save(surface, imagePath)
+            with open(indexPath, "w") as f:
+                json.dump(index, f)
+        except (OSError, pygame.error):
+            #a read only checkout still gets the atlas, just not the cache
+            pass
+
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+
+    return Atlas(surface, index)
@@ -0,0 +1,22 @@
+"""Shared setup for the dungeon benchmarks
+
+Puts the repository root on sys.path so the dungeon package imports the same
+way it does for the game.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.join(ROOT, "tests")
+sys.path.insert(0, ROOT)
+
+from dungeon.maps import DungeonMap
+
+
+def build_grid_dungeon(num_rooms):
+    """A DungeonMap with num_rooms rooms laid out on a square grid, unconnected"""
+    dungeon = DungeonMap()
+    for i in range(num_rooms):
+        dungeon.add_room(f"Room {i + 1}", room_type="common")
+    dungeon.generate_map_as_grid()
+    return dungeon
@@ -0,0 +1,68 @@
+"""Time of the extra corridor pass in DungeonMap.generate_connections
+
+Runs add_random_connections (row/column index lookups) for len(rooms) // 2
+corridors on grid maps, next to the old scan over every room id per corridor,
+which is only run up to --legacy-max rooms.
+
+    python benchmarks/dungeon_corridors.py [--legacy-max 5000]
+"""
+import argparse
+import random
+import time
+
+from dungeon_common import build_grid_dungeon
+
+SIZES = (1000, 10000, 50000)
+
+
+def legacy_random_connections(dungeon, count):
+    """The extra corridor loop generate_connections used to run"""
+    room_ids = list(dungeon.rooms.keys())
+    for _ in range(count):
+        room1_id = random.choice(room_ids)
+        room1 = dungeon.rooms[room1_id]
+        available_directions = room1.get_available_directions()
+        if not available_directions:
+            continue
+        direction = random.choice(available_directions)
+        for room2_id in room_ids:
+            if room1_id != room2_id:
+                room2 = dungeon.rooms[room2_id]
+                if (direction == "north" and room1.x == room2.x and room1.y < room2.y) or \
+                   (direction == "south" and room1.x == room2.x and room1.y > room2.y) or \
+                   (direction == "east" and room1.y == room2.y and room1.x < room2.x) or \
+                   (direction == "west" and room1.y == room2.y and room1.x > room2.x):
+                    opposite = {"north": "south", "south": "north", "east": "west", "west": "east"}
+                    if opposite[direction] in room2.get_available_directions():
+                        dungeon.connect_rooms(room1_id, room2_id, direction)
+                        break
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--legacy-max", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'rooms':>8} {'extra':>7} {'indexed ms':>11} {'legacy ms':>10}")
+    for num_rooms in SIZES:
+        extra = num_rooms // 2
+
+        dungeon = build_grid_dungeon(num_rooms)
+        random.seed(num_rooms)
+        start = time.perf_counter()
+        dungeon.add_random_connections(extra)
+        indexed = (time.perf_counter() - start) * 1000
+
+        legacy = "-"
+        if num_rooms <= args.legacy_max:
+            dungeon = build_grid_dungeon(num_rooms)
+            random.seed(num_rooms)
+            start = time.perf_counter()
+            legacy_random_connections(dungeon, extra)
+            legacy = f"{(time.perf_counter() - start) * 1000:.1f}"
+
+        print(f"{num_rooms:>8} {extra:>7} {indexed:>11.1f} {legacy:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Time of dumping a DungeonMap as text, JSON Lines and DOT
+
+Writes a connected grid map through dungeon.export in every format, plain
+and gzipped, next to the old print_map loop (one print per line) writing
+to the same file.
+
+    python benchmarks/dungeon_dump.py [--rooms 100000] [--out /tmp]
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+from dungeon_common import build_grid_dungeon
+
+from dungeon.export import FORMATS
+
+
+def legacy_print_map(dungeon):
+    """The print_map loop before the exporter"""
+    print("\nMap Connections:")
+    for room_id, room in dungeon.rooms.items():
+        print(f"Room {room_id} ({room.name}):")
+        for direction, connected_id in room.connections.items():
+            connected_room = dungeon.rooms[connected_id]
+            print(f"  {direction.capitalize()} -> Room {connected_id} ({connected_room.name})")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--out", default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    dungeon = build_grid_dungeon(args.rooms)
+    dungeon.generate_connections()
+
+    print(f"{'output':<18} {'ms':>9} {'MB':>8}")
+
+    path = os.path.join(args.out, "dungeon-legacy.txt")
+    with open(path, "w") as f, contextlib.redirect_stdout(f):
+        start = time.perf_counter()
+        legacy_print_map(dungeon)
+        elapsed = (time.perf_counter() - start) * 1000
+    print(f"{'legacy print_map':<18} {elapsed:>9.1f} {os.path.getsize(path) / 1e6:>8.1f}")
+    os.remove(path)
+
+    for format in FORMATS:
+        for suffix in ("", ".gz"):
+            path = os.path.join(args.out, f"dungeon.{format}{suffix}")
+            start = time.perf_counter()
+            dungeon.export(path, format)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{format + suffix:<18} {elapsed:>9.1f} {os.path.getsize(path) / 1e6:>8.1f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
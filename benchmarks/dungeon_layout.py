@@ -0,0 +1,64 @@
+"""Grid layout and spanning tree time, 1,000 to 1,000,000 rooms
+
+generate_map_as_grid is timed on a DungeonMap and a CompactDungeonMap. The
+spanning tree is manhattan_mst over the resulting points, once with
+dungeon.graph's numpy path and once with numpy switched off, which must
+give the same tree; it is only run up to --mst-max rooms.
+
+    python benchmarks/dungeon_layout.py [--mst-max 100000]
+"""
+import argparse
+import random
+import time
+
+import dungeon_common  # puts the repository root on sys.path
+
+from dungeon import graph, maps
+
+SIZES = (1000, 10000, 100000, 1000000)
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mst-max", type=int, default=100000)
+    args = parser.parse_args()
+
+    if graph.np is None:
+        raise SystemExit("numpy is not installed")
+    numpy = graph.np
+
+    print(f"{'rooms':>8} {'map':>8} {'layout s':>9} {'mst py s':>9} {'mst np s':>9}")
+    for num_rooms in SIZES:
+        for cls in (maps.DungeonMap, maps.CompactDungeonMap):
+            dungeon = cls(random.Random(num_rooms))
+            for i in range(num_rooms):
+                dungeon.add_room(f"Room {i + 1}", x=0, y=0, room_type="common")
+
+            _, layout_time = timed(dungeon.generate_map_as_grid)
+
+            mst_python = mst_numpy = "-"
+            if num_rooms <= args.mst_max:
+                points = [(room.x, room.y) for room in dungeon.rooms.values()]
+                tree, elapsed = timed(graph.manhattan_mst, points)
+                mst_numpy = f"{elapsed:.3f}"
+                graph.np = None
+                try:
+                    python_tree, elapsed = timed(graph.manhattan_mst, points)
+                finally:
+                    graph.np = numpy
+                mst_python = f"{elapsed:.3f}"
+                if tree != python_tree:
+                    raise SystemExit(f"spanning trees differ at {num_rooms} rooms")
+
+            name = "compact" if cls is maps.CompactDungeonMap else "dict"
+            print(f"{num_rooms:>8} {name:>8} {layout_time:>9.3f} {mst_python:>9} {mst_numpy:>9}")
+
+
+if __name__ == "__main__":
+    main()
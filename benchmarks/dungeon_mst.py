@@ -0,0 +1,80 @@
+"""Spanning tree time for DungeonMap.generate_connections, 100 to 100,000 rooms
+
+Compares the Manhattan MST (candidate edges from an octant sweep + Kruskal)
+with the original O(n^3) Prim loop, which is only run up to --legacy-max rooms.
+
+    python benchmarks/dungeon_mst.py [--legacy-max 300]
+"""
+import argparse
+import random
+import time
+
+from dungeon_common import build_grid_dungeon
+from dungeon.graph import manhattan_mst
+
+SIZES = (100, 1000, 10000, 100000)
+
+
+def legacy_prim(rooms):
+    """The spanning tree loop generate_connections used to run"""
+    room_ids = list(rooms.keys())
+    connected = {room_ids[0]}
+    unconnected = set(room_ids[1:])
+    tree = []
+    while unconnected:
+        best_connection = None
+        best_distance = float('inf')
+        for c_id in connected:
+            c_room = rooms[c_id]
+            for u_id in unconnected:
+                u_room = rooms[u_id]
+                distance = abs(c_room.x - u_room.x) + abs(c_room.y - u_room.y)
+                if distance < best_distance:
+                    best_distance = distance
+                    best_connection = (c_id, u_id)
+        tree.append(best_connection)
+        connected.add(best_connection[1])
+        unconnected.remove(best_connection[1])
+    return tree
+
+
+def tree_length(points, tree):
+    return sum(abs(points[i][0] - points[j][0]) + abs(points[i][1] - points[j][1]) for i, j in tree)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--legacy-max", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'rooms':>8} {'layout':>8} {'mst s':>9} {'legacy s':>9}")
+    for num_rooms in SIZES:
+        for layout in ("grid", "scatter"):
+            dungeon = build_grid_dungeon(num_rooms)
+            if layout == "scatter":
+                side = int(num_rooms ** 0.5) * 4
+                for room in dungeon.rooms.values():
+                    room.x = random.randint(0, side)
+                    room.y = random.randint(0, side)
+            points = [(room.x, room.y) for room in dungeon.rooms.values()]
+
+            start = time.perf_counter()
+            tree = manhattan_mst(points)
+            mst_time = time.perf_counter() - start
+
+            legacy = "-"
+            if num_rooms <= args.legacy_max:
+                start = time.perf_counter()
+                legacy_tree = legacy_prim(dungeon.rooms)
+                legacy = f"{time.perf_counter() - start:.3f}"
+
+                index = {room_id: i for i, room_id in enumerate(dungeon.rooms)}
+                legacy_points = [(index[a], index[b]) for a, b in legacy_tree]
+                if tree_length(points, legacy_points) != tree_length(points, tree):
+                    raise SystemExit(f"tree lengths differ at {num_rooms} rooms")
+
+            print(f"{num_rooms:>8} {layout:>8} {mst_time:>9.3f} {legacy:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Time to render tests/test2.py's matplotlib dungeon map to a PNG, 100 to 10,000 rooms
+
+Renders a connected grid map headlessly with visualize_map, with and
+without labels and arrows, next to the original one-artist-per-room loop,
+which is only run up to --legacy-max rooms. Everything is saved at dpi=300.
+
+    python benchmarks/dungeon_render.py [--legacy-max 1000] [--out /tmp]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+from dungeon_common import TESTS_DIR
+
+sys.path.insert(0, TESTS_DIR)
+
+import test2
+
+SIZES = (100, 1000, 10000)
+
+
+def build_grid_map(num_rooms):
+    """A test2.DungeonMap on a square grid, each room joined to its east and north neighbours"""
+    dungeon = test2.DungeonMap()
+    side = int(num_rooms ** 0.5)
+    for i in range(num_rooms):
+        dungeon.add_room(f"Room {i + 1}", x=i % side, y=i // side)
+    for room_id, room in dungeon.rooms.items():
+        if room.x + 1 < side and room_id + 1 in dungeon.rooms:
+            dungeon.connect_rooms(room_id, room_id + 1, "east")
+        if room_id + side in dungeon.rooms:
+            dungeon.connect_rooms(room_id, room_id + side, "north")
+    return dungeon
+
+
+def legacy_visualize_map(dungeon, save_path):
+    """The drawing loop visualize_map used to run"""
+    plt.figure(figsize=(12, 10))
+    for room in dungeon.rooms.values():
+        for direction, connected_id in room.connections.items():
+            connected_room = dungeon.rooms[connected_id]
+            plt.plot([room.x, connected_room.x], [room.y, connected_room.y], 'k-', alpha=0.6)
+            mid_x = (room.x + connected_room.x) / 2
+            mid_y = (room.y + connected_room.y) / 2
+            dx, dy = test2.ARROW_OFFSETS[direction]
+            plt.arrow(mid_x - dx/2, mid_y - dy/2, dx, dy, head_width=0.1,
+                      head_length=0.1, fc='blue', ec='blue', alpha=0.7)
+    for room in dungeon.rooms.values():
+        color = test2.ROOM_COLORS.get(room.room_type, 'lightgray')
+        plt.gca().add_patch(plt.Circle((room.x, room.y), 0.3, color=color, alpha=0.7))
+        plt.text(room.x, room.y, str(room.id), horizontalalignment='center',
+                 verticalalignment='center', fontweight='bold')
+        plt.text(room.x, room.y - 0.4, room.name, horizontalalignment='center',
+                 verticalalignment='center', fontsize=8)
+    plt.gca().set_aspect('equal')
+    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def timed(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--legacy-max", type=int, default=1000)
+    parser.add_argument("--out", default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    path = os.path.join(args.out, "dungeon-render.png")
+    print(f"{'rooms':>8} {'detail s':>9} {'lod s':>9} {'legacy s':>9}")
+    for num_rooms in SIZES:
+        dungeon = build_grid_map(num_rooms)
+        detail = timed(dungeon.visualize_map, save_path=path, show=False, detail=True)
+        lod = timed(dungeon.visualize_map, save_path=path, show=False)
+        legacy = "-"
+        if num_rooms <= args.legacy_max:
+            legacy = f"{timed(legacy_visualize_map, dungeon, path):.2f}"
+        print(f"{num_rooms:>8} {detail:>9.2f} {lod:>9.2f} {legacy:>9}")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
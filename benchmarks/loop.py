@@ -0,0 +1,109 @@
+"""Headless per-phase timings for the game loop
+
+Runs game.Game under SDL's dummy video driver with scripted input, one fixed
+simulation step per frame, and prints percentiles for every loop phase as
+recorded by the game's own FrameProfiler.
+
+    python benchmarks/loop.py [--frames 600] [--scenario walk]
+"""
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import game
+from profiler import FrameProfiler
+
+PHASES = ("events", "simulation", "collision", "animation", "blit", "present")
+PERCENTILES = (50, 90, 99)
+
+#frame: [(event type, key)], keys stay held until released
+SCENARIOS = {
+    #walk right until the wall stops us
+    "walk": {
+        0: [(pygame.KEYDOWN, pygame.K_d)],
+    },
+    #sprint right, stamina runs out part way
+    "sprint": {
+        0: [(pygame.KEYDOWN, pygame.K_LSHIFT), (pygame.KEYDOWN, pygame.K_d)],
+    },
+    #walk right under the red cube, then down onto it and stand there
+    "collide": {
+        0: [(pygame.KEYDOWN, pygame.K_d)],
+        118: [(pygame.KEYUP, pygame.K_d), (pygame.KEYDOWN, pygame.K_s)],
+        168: [(pygame.KEYUP, pygame.K_s)],
+    },
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def keyEvent(kind, key):
+    return pygame.event.Event(kind, key=key, mod=0, unicode="", scancode=0)
+
+
+def runScenario(screen, name, frames):
+    #one ring slot per frame so nothing is overwritten before the report
+    timer = FrameProfiler(capacity=frames, enabled=True)
+    level = game.Game(screen, profiler=timer)
+    script = SCENARIOS[name]
+
+    for frame in range(frames):
+        events = [keyEvent(kind, key) for kind, key in script.get(frame, ())]
+        level.frame(game.SIM_STEP, events)
+    return level, timer
+
+
+def report(name, level, timer):
+    character = level.character
+    print(f"\n{name}: player at ({character.playerX:.0f}, {character.playerY:.0f}), "
+          f"health {character.health}, stamina {character.stamina}")
+    header = "".join(f"{f'p{p}':>9}" for p in PERCENTILES)
+    print(f"{'phase':<12}{header}{'max':>9}{'total':>10}   (ms)")
+
+    slots = timer.recentFrames()
+    frameTotals = [0.0] * len(slots)
+    for phase in PHASES:
+        history = timer.history[timer.names.index(phase)]
+        samples = [history[slot] for slot in slots]
+        for i, value in enumerate(samples):
+            frameTotals[i] += value
+        cells = "".join(f"{percentile(samples, p) * 1000:>9.3f}" for p in PERCENTILES)
+        print(f"{phase:<12}{cells}{max(samples) * 1000:>9.3f}{sum(samples) * 1000:>10.1f}")
+
+    cells = "".join(f"{percentile(frameTotals, p) * 1000:>9.3f}" for p in PERCENTILES)
+    print(f"{'frame':<12}{cells}{max(frameTotals) * 1000:>9.3f}{sum(frameTotals) * 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--trace", help="also write a Chrome trace of the last scenario here")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="scenario to run, repeatable (default: all)")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((game.WIDTH, game.HEIGHT))
+
+    for name in args.scenario or SCENARIOS:
+        level, timer = runScenario(screen, name, args.frames)
+        report(name, level, timer)
+
+    if args.trace:
+        print(f"\ntrace written to {timer.dumpTrace(args.trace)}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
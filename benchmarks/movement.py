@@ -0,0 +1,84 @@
+"""Entities per millisecond for the scalar and numpy movement + collision paths
+
+    python benchmarks/movement.py
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import collision
+import entities
+import physics
+
+WIDTH = 1200
+HEIGHT = 800
+SIZES = (1, 100, 1000, 10000)
+STEPS = 20
+
+#same arena as main.py
+WALLS = [
+    pygame.Rect(0, 0, 1200, 65),
+    pygame.Rect(0, 760, 1200, 40),
+    pygame.Rect(0, 0, 50, 800),
+    pygame.Rect(1150, 0, 50, 800),
+]
+
+
+def makeStore(count, seed=1):
+    rng = random.Random(seed)
+    store = entities.EntityStore()
+    for _ in range(count):
+        i = store.add(rng.uniform(0, WIDTH - 64), rng.uniform(0, HEIGHT - 64), speed=5)
+        store.inputs[i] = rng.randrange(16)
+        store.sprint[i] = rng.random() < 0.3
+    return store
+
+
+def scalarStep(store, mult, wallWorld):
+    collision.slideAll(store, mult, wallWorld)
+    entities.moveAll(store, mult)
+
+
+def batchStep(store, mult, walls):
+    physics.stepStore(store, mult, walls)
+
+
+def timeSteps(step, count, walls):
+    #only movement + collision is timed, steering and stamina are shared
+    store = makeStore(count)
+    elapsed = 0
+    for _ in range(STEPS):
+        entities.steerAll(store)
+        mult = entities.regenAll(store, 0, 2000)
+        start = time.perf_counter()
+        step(store, mult, walls)
+        elapsed += time.perf_counter() - start
+    return store, elapsed * 1000
+
+
+def main():
+    wallWorld = collision.SpatialHash()
+    for wall in WALLS:
+        wallWorld.insert(wall)
+    walls = physics.wallArray(WALLS)
+
+    print(f"{'entities':>8} {'scalar ent/ms':>14} {'numpy ent/ms':>13} {'speedup':>8}")
+    for count in SIZES:
+        scalarStore, scalarMs = timeSteps(scalarStep, count, wallWorld)
+        batchStore, batchMs = timeSteps(batchStep, count, walls)
+        if list(scalarStore.x) != list(batchStore.x) or list(scalarStore.y) != list(batchStore.y):
+            raise SystemExit(f"paths disagree at {count} entities")
+
+        scalarRate = count * STEPS / scalarMs
+        batchRate = count * STEPS / batchMs
+        print(f"{count:>8} {scalarRate:>14.1f} {batchRate:>13.1f} {batchRate / scalarRate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import pygame
+
+
+class SpatialHash:
+    """Uniform grid over static rects, built once per level"""
+
+    def __init__(self, cellSize=128):
+        self.cellSize = cellSize
+        self.cells = {}
+        self.rects = []
+        self.tags = []
+
+    def cellRange(self, rect):
+        size = self.cellSize
+        return (int(rect.left // size), int(rect.top // size),
+                int((rect.right - 1) // size), int((rect.bottom - 1) // size))
+
+    def insert(self, rect, tag=None):
+        rect = pygame.Rect(rect)
+        index = len(self.rects)
+        self.rects.append(rect)
+        self.tags.append(tag)
+
+        left, top, right, bottom = self.cellRange(rect)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                self.cells.setdefault((cx, cy), []).append(index)
+        return index
+
+    def queryIndices(self, rect):
+        left, top, right, bottom = self.cellRange(rect)
+        found = set()
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return sorted(found)
+
+    def query(self, rect):
+        #candidate rects sharing a cell with rect, may not actually overlap it
+        return [self.rects[i] for i in self.queryIndices(rect)]
+
+    def sweep(self, rect, dx, dy):
+        #candidates for a box moving by (dx, dy) this frame, padded a pixel
+        #each way since fractional moves truncate differently when negative
+        return self.query(rect.union(rect.move(dx, dy)).inflate(2, 2))
+
+    def collideAll(self, rect):
+        candidates = self.query(rect)
+        return [candidates[i] for i in rect.collidelistall(candidates)]
+
+    def __len__(self):
+        return len(self.rects)
+
+
+def slideAll(store, mult, world, offset=1, size=62):
+    """Stop each entity on any axis where its next move would enter a wall
+
+    Boxes are size x size at (x + offset, y + offset), velocities are zeroed
+    in place per axis so the entity slides along whatever it hit"""
+    x = store.x
+    y = store.y
+    vx = store.vx
+    vy = store.vy
+    speed = store.speed
+    for i in range(len(x)):
+        box = pygame.Rect(x[i] + offset, y[i] + offset, size, size)
+        moveX = vx[i] * speed[i] * mult[i]
+        moveY = vy[i] * speed[i] * mult[i]
+        nearby = world.sweep(box, moveX, moveY)
+        if nearby:
+            #check for y collisions
+            if pygame.Rect(box.x, box.y + moveY, size, size).collidelist(nearby) != -1:
+                vy[i] = 0
+            #check for x collision
+            if pygame.Rect(box.x + moveX, box.y, size, size).collidelist(nearby) != -1:
+                vx[i] = 0
@@ -0,0 +1 @@
+"""Dungeon map data structures and algorithms shared by the dungeon tools"""
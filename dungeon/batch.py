@@ -0,0 +1,75 @@
+"""Generate and score many dungeons at once across processes
+
+Each seed is built, scored and serialized inside a worker process, so only
+the compact bytes of dungeon.format and a few numbers come back; the parent
+never builds Room objects or pays to pickle them.
+"""
+import functools
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .format import compact_rooms, dumps
+
+BatchResult = namedtuple("BatchResult", "seed data scores")
+
+
+def score_rooms(rooms):
+    """Layout quality numbers for a DungeonMap.rooms mapping
+
+    reachability   share of rooms reachable from the first room
+    dead_ends      rooms with exactly one exit
+    branching      average number of exits per room"""
+    if not rooms:
+        return {"reachability": 0.0, "dead_ends": 0, "branching": 0.0}
+
+    start = next(iter(rooms))
+    seen = {start}
+    queue = deque([start])
+    exits = 0
+    dead_ends = 0
+    while queue:
+        for connected_id in rooms[queue.popleft()].connections.values():
+            if connected_id not in seen and connected_id in rooms:
+                seen.add(connected_id)
+                queue.append(connected_id)
+
+    for room in rooms.values():
+        count = len(room.connections)
+        exits += count
+        if count == 1:
+            dead_ends += 1
+
+    return {
+        "reachability": len(seen) / len(rooms),
+        "dead_ends": dead_ends,
+        "branching": exits / len(rooms),
+    }
+
+
+def serialize(dungeon):
+    """dungeon.format bytes for a DungeonMap or CompactDungeonMap"""
+    store = getattr(dungeon, "store", None)
+    if store is None:
+        store = compact_rooms(dungeon.rooms)
+    return dumps(store)
+
+
+def build_and_score(build, params, seed):
+    """Worker side: build(seed, **params), then score and serialize it"""
+    dungeon = build(seed, **params)
+    return BatchResult(seed, serialize(dungeon), score_rooms(dungeon.rooms))
+
+
+def generate_batch(build, seeds, max_workers=None, chunksize=1, mp_context=None, **params):
+    """BatchResults for build(seed, **params) over seeds, in seed order
+
+    build is pickled by name, so it must be a module-level function of an
+    importable module, not of a script: workers started with "spawn" (the
+    default on Windows and macOS) import it afresh. mp_context picks the
+    start method, max_workers=0 runs everything in this process, which is
+    handy for debugging."""
+    job = functools.partial(build_and_score, build, params)
+    if max_workers == 0:
+        return [job(seed) for seed in seeds]
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as pool:
+        return list(pool.map(job, seeds, chunksize=chunksize))
@@ -0,0 +1,201 @@
+"""Packed array storage for dungeon rooms
+
+Rooms live in parallel arrays indexed by room id - 1 instead of one Room
+object and connections dict each. Names and descriptions are interned in a
+template table and room types are small ints, so a room costs a few dozen
+bytes. RoomsView and RoomView give the same attribute access as
+DungeonMap.rooms and Room on top of the arrays.
+"""
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+ROOM_TYPES = ('common', 'treasure', 'monster', 'trap', 'boss', 'entrance', 'exit')
+
+# Direction index d and its opposite (d + 2) % 4
+DIRECTIONS = ("north", "east", "south", "west")
+DIRECTION_INDEX = {direction: d for d, direction in enumerate(DIRECTIONS)}
+
+NO_ROOM = 0  # adjacency value for "no connection", room ids start at 1
+
+
+class CompactRooms:
+    """Parallel arrays holding every room of one map"""
+
+    def __init__(self):
+        self.xs = array('i')
+        self.ys = array('i')
+        self.types = array('B')       # index into type_names
+        self.templates = array('I')   # index into template_table
+        self.adjacency = array('I')   # 4 room ids per room, NO_ROOM if unconnected
+        self.type_names = list(ROOM_TYPES)
+        self.template_table = []      # [(name, description or None)]
+        self._type_codes = {name: code for code, name in enumerate(self.type_names)}
+        self._template_codes = {}
+
+    def __len__(self):
+        return len(self.xs)
+
+    def intern_type(self, room_type):
+        code = self._type_codes.get(room_type)
+        if code is None:
+            code = len(self.type_names)
+            self.type_names.append(room_type)
+            self._type_codes[room_type] = code
+        return code
+
+    def intern_template(self, name, description):
+        key = (name, description)
+        code = self._template_codes.get(key)
+        if code is None:
+            code = len(self.template_table)
+            self.template_table.append(key)
+            self._template_codes[key] = code
+        return code
+
+    def add(self, name, description, x, y, room_type):
+        """Append a room and return its id"""
+        self.xs.append(x)
+        self.ys.append(y)
+        self.types.append(self.intern_type(room_type))
+        self.templates.append(self.intern_template(name, description))
+        self.adjacency.extend((NO_ROOM, NO_ROOM, NO_ROOM, NO_ROOM))
+        return len(self.xs)
+
+    def name(self, room_id):
+        return self.template_table[self.templates[room_id - 1]][0]
+
+    def description(self, room_id):
+        description = self.template_table[self.templates[room_id - 1]][1]
+        return description or f"Room {room_id}"
+
+    def room_type(self, room_id):
+        return self.type_names[self.types[room_id - 1]]
+
+    def neighbour(self, room_id, d):
+        return self.adjacency[(room_id - 1) * 4 + d]
+
+    def set_neighbour(self, room_id, d, other_id):
+        self.adjacency[(room_id - 1) * 4 + d] = other_id
+
+
+class ConnectionsView(MutableMapping):
+    """direction: room_id mapping over one room's adjacency slots"""
+    __slots__ = ("store", "base")
+
+    def __init__(self, store, room_id):
+        self.store = store
+        self.base = (room_id - 1) * 4
+
+    def __getitem__(self, direction):
+        value = self.store.adjacency[self.base + DIRECTION_INDEX[direction]]
+        if value == NO_ROOM:
+            raise KeyError(direction)
+        return value
+
+    def __setitem__(self, direction, room_id):
+        self.store.adjacency[self.base + DIRECTION_INDEX[direction]] = room_id
+
+    def __delitem__(self, direction):
+        self[direction]
+        self.store.adjacency[self.base + DIRECTION_INDEX[direction]] = NO_ROOM
+
+    def __iter__(self):
+        adjacency = self.store.adjacency
+        for d, direction in enumerate(DIRECTIONS):
+            if adjacency[self.base + d] != NO_ROOM:
+                yield direction
+
+    def __len__(self):
+        adjacency = self.store.adjacency
+        return sum(1 for d in range(4) if adjacency[self.base + d] != NO_ROOM)
+
+    def __contains__(self, direction):
+        d = DIRECTION_INDEX.get(direction)
+        return d is not None and self.store.adjacency[self.base + d] != NO_ROOM
+
+
+class RoomView:
+    """Room-compatible view of one room in a CompactRooms store"""
+    __slots__ = ("store", "id")
+
+    def __init__(self, store, room_id):
+        self.store = store
+        self.id = room_id
+
+    def __repr__(self):
+        return f"Room({self.id}, '{self.name}')"
+
+    def __eq__(self, other):
+        return isinstance(other, RoomView) and other.store is self.store and other.id == self.id
+
+    def __hash__(self):
+        return hash((id(self.store), self.id))
+
+    @property
+    def name(self):
+        return self.store.name(self.id)
+
+    @property
+    def description(self):
+        return self.store.description(self.id)
+
+    @property
+    def room_type(self):
+        return self.store.room_type(self.id)
+
+    @room_type.setter
+    def room_type(self, value):
+        self.store.types[self.id - 1] = self.store.intern_type(value)
+
+    @property
+    def x(self):
+        return self.store.xs[self.id - 1]
+
+    @x.setter
+    def x(self, value):
+        self.store.xs[self.id - 1] = value
+
+    @property
+    def y(self):
+        return self.store.ys[self.id - 1]
+
+    @y.setter
+    def y(self, value):
+        self.store.ys[self.id - 1] = value
+
+    @property
+    def connections(self):
+        return ConnectionsView(self.store, self.id)
+
+    def add_connection(self, direction, room_id):
+        self.store.set_neighbour(self.id, DIRECTION_INDEX[direction], room_id)
+
+    def get_available_directions(self, valid_directions=None):
+        """Return directions that don't have connections yet"""
+        if valid_directions is None:
+            valid_directions = ["north", "east", "south", "west"]
+        base = (self.id - 1) * 4
+        adjacency = self.store.adjacency
+        return [d for d in valid_directions if adjacency[base + DIRECTION_INDEX[d]] == NO_ROOM]
+
+
+class RoomsView(Mapping):
+    """id: RoomView mapping, views are created on access and not kept"""
+    __slots__ = ("store",)
+
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, room_id):
+        if not isinstance(room_id, int) or not 1 <= room_id <= len(self.store):
+            raise KeyError(room_id)
+        return RoomView(self.store, room_id)
+
+    def __contains__(self, room_id):
+        return isinstance(room_id, int) and 1 <= room_id <= len(self.store)
+
+    def __iter__(self):
+        return iter(range(1, len(self.store) + 1))
+
+    def __len__(self):
+        return len(self.store)
@@ -0,0 +1,115 @@
+"""Streaming text, JSON Lines and DOT export for DungeonMap
+
+Every format is written in one pass over the rooms. Output for BATCH_ROOMS
+rooms is joined into one string before it goes to the writer, so a dump
+costs one write call per batch instead of one print per line.
+"""
+import gzip
+import json
+import sys
+
+OPPOSITE_DIRECTIONS = {"north": "south", "south": "north", "east": "west", "west": "east"}
+
+BATCH_ROOMS = 4096
+BUFFER_SIZE = 1 << 20
+GZIP_LEVEL = 6  # gzip's default of 9 takes twice as long for ~4% smaller files
+
+
+def _batched(rooms, format_room):
+    """Join the formatted rooms into one string per BATCH_ROOMS rooms"""
+    parts = []
+    for count, (room_id, room) in enumerate(rooms.items(), 1):
+        format_room(parts, room_id, room)
+        if count % BATCH_ROOMS == 0:
+            yield "".join(parts)
+            parts = []
+    if parts:
+        yield "".join(parts)
+
+
+def text_lines(rooms):
+    """The print_map layout"""
+    def format_room(parts, room_id, room):
+        parts.append(f"Room {room_id} ({room.name}):\n")
+        for direction, connected_id in room.connections.items():
+            parts.append(f"  {direction.capitalize()} -> Room {connected_id} ({rooms[connected_id].name})\n")
+        parts.append("\n")
+
+    yield "\nMap Connections:\n"
+    yield from _batched(rooms, format_room)
+
+
+def jsonl_lines(rooms):
+    """One JSON object per room"""
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+    def format_room(parts, room_id, room):
+        parts.append(dumps({
+            "id": room_id,
+            "name": room.name,
+            "description": room.description,
+            "type": room.room_type,
+            "x": room.x,
+            "y": room.y,
+            "connections": dict(room.connections),
+        }))
+        parts.append("\n")
+
+    yield from _batched(rooms, format_room)
+
+
+def dot_lines(rooms):
+    """Graphviz graph, pinned to the room coordinates for neato -n
+
+    A reciprocal pair of connections is one edge, one-way connections get an
+    arrowhead."""
+    quote = json.JSONEncoder(ensure_ascii=False).encode
+
+    def format_room(parts, room_id, room):
+        parts.append(f'  {room_id} [label={quote(room.name)}, type={room.room_type}, '
+                     f'pos="{room.x},{room.y}!"];\n')
+        for direction, connected_id in room.connections.items():
+            connected_room = rooms.get(connected_id)
+            reciprocal = connected_room is not None and \
+                connected_room.connections.get(OPPOSITE_DIRECTIONS[direction]) == room_id
+            if reciprocal and connected_id < room_id:
+                continue
+            arrow = "none" if reciprocal else "normal"
+            parts.append(f'  {room_id} -- {connected_id} [label={direction}, dir=forward, arrowhead={arrow}];\n')
+
+    yield "graph dungeon {\n"
+    yield from _batched(rooms, format_room)
+    yield "}\n"
+
+
+FORMATS = {
+    "text": text_lines,
+    "jsonl": jsonl_lines,
+    "dot": dot_lines,
+}
+
+
+def write(rooms, out, format="text"):
+    """Write rooms to an open text file in one of FORMATS"""
+    for chunk in FORMATS[format](rooms):
+        out.write(chunk)
+
+
+def export(rooms, path, format="text", compress=None):
+    """Write rooms to path, gzipped if compress is set or path ends in .gz"""
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        with gzip.open(path, "wt", compresslevel=GZIP_LEVEL, encoding="utf-8", newline="\n") as out:
+            write(rooms, out, format)
+    else:
+        with open(path, "w", encoding="utf-8", newline="\n", buffering=BUFFER_SIZE) as out:
+            write(rooms, out, format)
+    return path
+
+
+def dump(rooms, out=None, format="text"):
+    """Write rooms to out (stdout by default) and flush once at the end"""
+    out = sys.stdout if out is None else out
+    write(rooms, out, format)
+    out.flush()
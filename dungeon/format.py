@@ -0,0 +1,256 @@
+"""Versioned binary file format for dungeon maps
+
+All integers are little-endian and every section starts on a 4-byte boundary:
+
+    header      magic "DGNM", version, room, type, template and string counts
+    xs, ys      int32 per room
+    types       uint8 per room, index into the type table, padded to 4 bytes
+    templates   uint32 per room, index into the template table
+    adjacency   4 x uint32 per room (north, east, south, west), 0 = no room
+    type table  uint32 string index per room type name
+    template table  (name, description) uint32 string index pairs,
+                    NO_STRING for a default "Room <id>" description
+    strings     uint32 end offset per string, then the UTF-8 bytes
+
+The columns match CompactRooms, so save writes its arrays straight out, and
+MappedRooms serves them from an mmap of the file: opening a map costs the
+same for 10 rooms or 1M, and a room's strings are decoded on first access.
+"""
+import io
+import mmap
+import struct
+import sys
+from array import array
+
+from .compact import DIRECTION_INDEX, CompactRooms
+
+MAGIC = b"DGNM"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIII")  # magic, version, flags, rooms, types, templates, strings
+NO_STRING = 0xFFFFFFFF
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _padding(size):
+    return -size % 4
+
+
+def compact_rooms(rooms):
+    """Pack a DungeonMap.rooms mapping of Room objects into a CompactRooms store
+
+    Room ids must run from 1 to len(rooms), as they do for maps built with
+    add_room."""
+    store = CompactRooms()
+    for expected_id, room_id in enumerate(sorted(rooms), 1):
+        if room_id != expected_id:
+            raise ValueError(f"room ids must be 1..{len(rooms)}, found {room_id}")
+        room = rooms[room_id]
+        description = room.description
+        if description == f"Room {room_id}":
+            description = None
+        store.add(room.name, description, room.x, room.y, room.room_type)
+        for direction, connected_id in room.connections.items():
+            store.set_neighbour(room_id, DIRECTION_INDEX[direction], connected_id)
+    return store
+
+
+def save(store, path):
+    """Write a CompactRooms (or MappedRooms) store to path in one pass"""
+    with open(path, "wb") as f:
+        write(store, f)
+    return path
+
+
+def dumps(store):
+    """The saved form of a store as bytes, e.g. to send between processes"""
+    f = io.BytesIO()
+    write(store, f)
+    return f.getvalue()
+
+
+def write(store, f):
+    """Write a store to a binary file object"""
+    strings = {}
+    string_list = []
+
+    def intern(text):
+        if text is None:
+            return NO_STRING
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(string_list)
+            string_list.append(text.encode("utf-8"))
+        return index
+
+    type_table = array("I", (intern(name) for name in store.type_names))
+    template_table = array("I")
+    for name, description in store.template_table:
+        template_table.append(intern(name))
+        template_table.append(intern(description))
+
+    ends = array("I")
+    end = 0
+    for encoded in string_list:
+        end += len(encoded)
+        ends.append(end)
+
+    columns = [
+        array("i", store.xs),
+        array("i", store.ys),
+        array("B", store.types),
+        array("I", store.templates),
+        array("I", store.adjacency),
+        type_table,
+        template_table,
+        ends,
+    ]
+    n = len(store)
+    f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, n, len(type_table),
+                        len(store.template_table), len(string_list)))
+    for column in columns:
+        if not _LITTLE_ENDIAN and column.itemsize > 1:
+            column.byteswap()
+        f.write(memoryview(column))
+        f.write(bytes(_padding(len(column) * column.itemsize)))
+    for encoded in string_list:
+        f.write(encoded)
+
+
+class MappedRooms:
+    """Read-only CompactRooms over a memory-mapped save file
+
+    Plugs into RoomsView and CompactDungeonMap like an in-memory store;
+    nothing but the header is read until a room is accessed. source is a
+    path, or the bytes from dumps, which are read in place the same way."""
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.map = None
+            buffer = source
+            name = "data"
+        else:
+            with open(source, "rb") as f:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = self.map
+            name = source
+        length = len(buffer)
+        if length < HEADER.size:
+            self._close_map()
+            raise ValueError(f"{name} is too short to be a dungeon map file")
+        magic, version, flags, n, type_count, template_count, string_count = \
+            HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            self._close_map()
+            raise ValueError(f"{name} is not a dungeon map file")
+        if version != FORMAT_VERSION:
+            self._close_map()
+            raise ValueError(f"{name} has format version {version}, expected {FORMAT_VERSION}")
+
+        # every section has to fit before any view is taken, so a truncated
+        # file fails here instead of on the first room that reaches past it
+        size = HEADER.size
+        for itemsize, items in ((4, n), (4, n), (1, n), (4, n), (4, 4 * n),
+                                (4, type_count), (4, 2 * template_count), (4, string_count)):
+            size += items * itemsize + _padding(items * itemsize)
+        if size <= length and string_count:
+            size += struct.unpack_from("<I", buffer, size - 4)[0]
+        if size > length:
+            self._close_map()
+            raise ValueError(f"{name} is truncated, expected at least {size} bytes, found {length}")
+
+        self.count = n
+        view = memoryview(buffer)
+        offset = HEADER.size
+
+        def column(typecode, length):
+            nonlocal offset
+            itemsize = array(typecode).itemsize
+            size = length * itemsize
+            data = view[offset:offset + size]
+            offset += size + _padding(size)
+            if itemsize == 1:
+                return data
+            if _LITTLE_ENDIAN:
+                return data.cast(typecode)
+            # the file is little-endian, big-endian hosts pay for a copy
+            values = array(typecode, data.tobytes())
+            values.byteswap()
+            return values
+
+        self.xs = column("i", n)
+        self.ys = column("i", n)
+        self.types = column("B", n)
+        self.templates = column("I", n)
+        self.adjacency = column("I", 4 * n)
+        self._type_strings = column("I", type_count)
+        self._template_strings = column("I", 2 * template_count)
+        self._string_ends = column("I", string_count)
+        self._string_base = offset
+        self._strings = {}
+        self._view = view
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        """Release the mapping, views handed out before this stop working"""
+        for name in ("xs", "ys", "types", "templates", "adjacency",
+                     "_type_strings", "_template_strings", "_string_ends"):
+            column = getattr(self, name)
+            if isinstance(column, memoryview):
+                column.release()
+        self._view.release()
+        self._close_map()
+
+    def _close_map(self):
+        if self.map is not None:
+            self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def string(self, index):
+        if index == NO_STRING:
+            return None
+        text = self._strings.get(index)
+        if text is None:
+            start = self._string_ends[index - 1] if index else 0
+            end = self._string_ends[index]
+            base = self._string_base
+            text = self._strings[index] = str(self._view[base + start:base + end], "utf-8")
+        return text
+
+    @property
+    def type_names(self):
+        return [self.string(index) for index in self._type_strings]
+
+    @property
+    def template_table(self):
+        pairs = self._template_strings
+        return [(self.string(pairs[i]), self.string(pairs[i + 1])) for i in range(0, len(pairs), 2)]
+
+    def add(self, name, description, x, y, room_type):
+        raise TypeError("mapped dungeon files are read-only")
+
+    def intern_type(self, room_type):
+        raise TypeError("mapped dungeon files are read-only")
+
+    def name(self, room_id):
+        return self.string(self._template_strings[2 * self.templates[room_id - 1]])
+
+    def description(self, room_id):
+        description = self.string(self._template_strings[2 * self.templates[room_id - 1] + 1])
+        return description or f"Room {room_id}"
+
+    def room_type(self, room_id):
+        return self.string(self._type_strings[self.types[room_id - 1]])
+
+    def neighbour(self, room_id, d):
+        return self.adjacency[(room_id - 1) * 4 + d]
+
+    def set_neighbour(self, room_id, d, other_id):
+        raise TypeError("mapped dungeon files are read-only")
@@ -0,0 +1,191 @@
+"""Graph helpers for DungeonMap: union-find and Manhattan minimum spanning trees
+
+numpy is optional; with it the sorting around the octant sweeps runs in bulk
+for integer points, and the resulting tree is the same as without it."""
+import numbers
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class DisjointSet:
+    """Union-find over the integers 0..n-1 with path halving and union by size
+
+    With a typecode the parent and size tables are array.array columns, which
+    keeps big sets to a few bytes per element."""
+
+    def __init__(self, n=0, typecode=None):
+        if typecode is None:
+            self.parent = list(range(n))
+            self.size = [1] * n
+        else:
+            self.parent = array(typecode, range(n))
+            self.size = array(typecode, [1]) * n
+        self.components = n
+
+    def add(self):
+        """Add a new singleton set and return its index"""
+        index = len(self.parent)
+        self.parent.append(index)
+        self.size.append(1)
+        self.components += 1
+        return index
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a, b):
+        """Merge the sets holding a and b, returns False if already joined"""
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.components -= 1
+        return True
+
+
+def _octant_sweep(order, positions, values, m, edges):
+    """Nearest neighbour of every point in one octant, appended as (dist, i, j)
+
+    For point i the octant is every j with xj >= xi and yj - xj >= yi - xi,
+    where the closest point is simply the one with the smallest xj + yj. Points
+    are swept by decreasing x (order) with a Fenwick tree holding the running
+    minimum of x + y (values) keyed by y - x. positions[i] is 1 for the
+    largest y - x up to m for the smallest."""
+    # Fenwick tree for prefix minimum
+    best_value = [None] * (m + 1)
+    best_index = [-1] * (m + 1)
+
+    for i in order:
+        position = positions[i]
+        value = values[i]
+
+        # query: smallest x + y among swept points with key >= this one
+        found_value = None
+        found_index = -1
+        p = position
+        while p > 0:
+            if best_value[p] is not None and (found_value is None or best_value[p] < found_value):
+                found_value = best_value[p]
+                found_index = best_index[p]
+            p -= p & -p
+        if found_index != -1:
+            edges.append((found_value - value, i, found_index))
+
+        # insert
+        p = position
+        while p <= m:
+            if best_value[p] is None or value < best_value[p]:
+                best_value[p] = value
+                best_index[p] = i
+            p += p & -p
+
+
+def _octant_candidates(xs, ys, edges):
+    n = len(xs)
+    keys = sorted(set(ys[i] - xs[i] for i in range(n)))
+    rank = {key: r for r, key in enumerate(keys)}
+    m = len(keys)
+    positions = [m - rank[ys[i] - xs[i]] for i in range(n)]
+    values = [xs[i] + ys[i] for i in range(n)]
+    order = sorted(range(n), key=lambda i: (-xs[i], -ys[i]))
+    _octant_sweep(order, positions, values, m, edges)
+
+
+def _octant_candidates_numpy(xs, ys, edges):
+    # the same inputs as _octant_candidates; lexsort is stable like sorted,
+    # so equal points are swept in the same order
+    keys, rank = np.unique(ys - xs, return_inverse=True)
+    m = len(keys)
+    order = np.lexsort((-ys, -xs))
+    _octant_sweep(order.tolist(), (m - rank).tolist(), (xs + ys).tolist(), m, edges)
+
+
+def _use_numpy(points):
+    """Whether points can go through int64 arrays without changing any value
+
+    Floats and integers past int64 would be truncated or wrap, so they take
+    the pure python path instead and get the same tree either way."""
+    if np is None:
+        return False
+    # leaves room for the distances, which add two differences
+    limit = 2 ** 60
+    for point in points:
+        for value in point:
+            if not isinstance(value, numbers.Integral) or not -limit < value < limit:
+                return False
+    return True
+
+
+def manhattan_candidate_edges(points):
+    """At most 4n edges that are guaranteed to contain a Manhattan MST
+
+    Returns (distance, i, j) tuples indexing into points."""
+    return _candidate_edges(points, _use_numpy(points))
+
+
+def _candidate_edges(points, use_numpy):
+    # the four transforms map the octants at 45-90, 0-45, 90-135 and 135-180
+    # degrees onto the one the sweep handles, the other half plane is covered
+    # because every edge is found from whichever end sees the other above it
+    edges = []
+    if use_numpy:
+        coordinates = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        xs = coordinates[:, 0]
+        ys = coordinates[:, 1]
+        for tx, ty in ((xs, ys), (ys, xs), (-xs, ys), (ys, -xs)):
+            _octant_candidates_numpy(tx, ty, edges)
+        return edges
+
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    for tx, ty in ((xs, ys), (ys, xs), ([-x for x in xs], ys), (ys, [-x for x in xs])):
+        _octant_candidates(tx, ty, edges)
+    return edges
+
+
+def _sorted_edges(edges, use_numpy):
+    """edges in the order sorted() would give, with numpy when use_numpy"""
+    if not use_numpy or not edges:
+        return sorted(edges)
+    table = np.array(edges, dtype=np.int64)
+    order = np.lexsort((table[:, 2], table[:, 1], table[:, 0]))
+    return table[order].tolist()
+
+
+def kruskal(n, edges, presorted=False):
+    """Minimum spanning forest of (weight, i, j) edges as a list of (i, j)"""
+    sets = DisjointSet(n)
+    tree = []
+    for weight, i, j in (edges if presorted else sorted(edges)):
+        if sets.union(i, j):
+            tree.append((i, j))
+            if len(tree) == n - 1:
+                break
+    return tree
+
+
+def manhattan_mst(points):
+    """Minimum spanning tree of 2D points under Manhattan distance in O(n log n)
+
+    Returns n - 1 (i, j) index pairs. The same points in the same order
+    always give the same tree, with or without numpy. When several trees
+    share the minimum length, as on grids, which one comes back depends on
+    the candidate edges and their (distance, i, j) order; it can differ from
+    the one a Prim loop would pick, with the same total length."""
+    if len(points) < 2:
+        return []
+    use_numpy = _use_numpy(points)
+    edges = _sorted_edges(_candidate_edges(points, use_numpy), use_numpy)
+    return kruskal(len(points), edges, presorted=True)
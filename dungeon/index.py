@@ -0,0 +1,113 @@
+"""Spatial indexes over room coordinates for DungeonMap"""
+from bisect import bisect_left, bisect_right, insort
+
+_LOW = float('-inf')
+_HIGH = float('inf')
+
+
+class CoordinateIndex:
+    """Rooms kept sorted per row (by x) and per column (by y)
+
+    Finding the nearest room in line with a position in a given direction is
+    then a bisect into one row or column instead of a scan over every room.
+    North is increasing y and east is increasing x, as in generate_connections.
+    """
+
+    def __init__(self):
+        self.rows = {}     # y: sorted [(x, room_id)]
+        self.columns = {}  # x: sorted [(y, room_id)]
+
+    def add(self, room_id, x, y):
+        insort(self.rows.setdefault(y, []), (x, room_id))
+        insort(self.columns.setdefault(x, []), (y, room_id))
+
+    def remove(self, room_id, x, y):
+        row = self.rows[y]
+        del row[bisect_left(row, (x, room_id))]
+        if not row:
+            del self.rows[y]
+        column = self.columns[x]
+        del column[bisect_left(column, (y, room_id))]
+        if not column:
+            del self.columns[x]
+
+    def move(self, room_id, old_x, old_y, x, y):
+        self.remove(room_id, old_x, old_y)
+        self.add(room_id, x, y)
+
+    def rebuild(self, rooms):
+        """Re-index every room at once, for bulk coordinate changes"""
+        self.rows = {}
+        self.columns = {}
+        for room_id, room in rooms.items():
+            self.rows.setdefault(room.y, []).append((room.x, room_id))
+            self.columns.setdefault(room.x, []).append((room.y, room_id))
+        self._sort()
+
+    def rebuild_from(self, room_ids, xs, ys):
+        """rebuild from parallel sequences, without going through the rooms"""
+        rows = self.rows = {}
+        columns = self.columns = {}
+        for room_id, x, y in zip(room_ids, xs, ys):
+            rows.setdefault(y, []).append((x, room_id))
+            columns.setdefault(x, []).append((y, room_id))
+        self._sort()
+
+    def _sort(self):
+        for entries in self.rows.values():
+            entries.sort()
+        for entries in self.columns.values():
+            entries.sort()
+
+    def aligned(self, x, y, direction):
+        """Room ids in line with (x, y) in direction, nearest first"""
+        if direction in ("north", "south"):
+            line = self.columns.get(x, ())
+            position = y
+        else:
+            line = self.rows.get(y, ())
+            position = x
+
+        if direction in ("north", "east"):
+            for i in range(bisect_right(line, (position, _HIGH)), len(line)):
+                yield line[i][1]
+        else:
+            for i in range(bisect_left(line, (position, _LOW)) - 1, -1, -1):
+                yield line[i][1]
+
+    def nearest(self, x, y, direction):
+        """Closest room id in line with (x, y) in direction, or None"""
+        return next(self.aligned(x, y, direction), None)
+
+
+class GridIndex:
+    """Items bucketed by every grid cell their bounding box touches
+
+    For culling and hit-testing: a rectangle query only looks at the cells
+    it overlaps, so its cost depends on what is near the rectangle rather
+    than on the number of items."""
+
+    def __init__(self, cell_size=8):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy): [item]
+
+    def clear(self):
+        self.cells = {}
+
+    def insert(self, item, min_x, min_y, max_x=None, max_y=None):
+        size = self.cell_size
+        if max_x is None:
+            max_x, max_y = min_x, min_y
+        for cy in range(int(min_y // size), int(max_y // size) + 1):
+            for cx in range(int(min_x // size), int(max_x // size) + 1):
+                self.cells.setdefault((cx, cy), []).append(item)
+
+    def query(self, min_x, min_y, max_x, max_y):
+        """Items whose cells overlap the rectangle, each once, in insertion order per cell"""
+        size = self.cell_size
+        found = {}
+        for cy in range(int(min_y // size), int(max_y // size) + 1):
+            for cx in range(int(min_x // size), int(max_x // size) + 1):
+                for item in self.cells.get((cx, cy), ()):
+                    found[item] = None
+        return list(found)
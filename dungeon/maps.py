@@ -0,0 +1,728 @@
+"""Dungeon maps: rooms, generation, validation, saving and batch building
+
+DungeonMap keeps Room objects in a dict, CompactDungeonMap keeps rooms in the
+packed arrays of dungeon.compact and ChunkedDungeon builds an endless map
+chunk by chunk from a seed. Nothing here needs pygame, so build_dungeon can
+run in worker processes under any multiprocessing start method.
+"""
+import hashlib
+import math
+import os
+import random
+from array import array
+from collections import OrderedDict
+
+from . import batch as dungeon_batch, export as dungeon_export
+from .compact import DIRECTION_INDEX, DIRECTIONS, NO_ROOM, ROOM_TYPES, CompactRooms, RoomsView
+from .format import FORMAT_VERSION, MappedRooms, compact_rooms, dumps, save
+from .graph import DisjointSet, kruskal, manhattan_mst
+from .index import CoordinateIndex
+from .paths import PathFinder
+
+OPPOSITE_DIRECTIONS = {"north": "south", "south": "north", "east": "west", "west": "east"}
+
+# load_dungeon keeps generated maps under the repository's cache directory;
+# bump the version whenever build_dungeon would build a different map
+DUNGEON_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "dungeons")
+DUNGEON_GENERATOR_VERSION = 1
+
+class Room:
+    def __init__(self, id, name, description=None, x=0, y=0, rng=random):
+        self.id = id
+        self.name = name
+        self.description = description or f"Room {id}"
+        self.x = x  # Coordinates for visualization
+        self.y = y
+        self.connections = {}  # direction: room_id
+        self.room_type = rng.choice(['common', 'treasure', 'monster', 'trap', 'boss', 'entrance', 'exit'])
+        
+    def __repr__(self):
+        return f"Room({self.id}, '{self.name}')"
+        
+    def add_connection(self, direction, room_id):
+        self.connections[direction] = room_id
+        
+    def get_available_directions(self, valid_directions=None):
+        """Return directions that don't have connections yet"""
+        if valid_directions is None:
+            valid_directions = ["north", "east", "south", "west"]
+        return [d for d in valid_directions if d not in self.connections]
+
+class DungeonMap:
+    def __init__(self, rng=None):
+        # every random choice goes through rng, pass random.Random(seed) for
+        # a reproducible map; the default is the global random module
+        self.rng = random if rng is None else rng
+        self.rooms = {}  # id: Room
+        self.max_room_id = 0
+        self.selected_room = None
+        self.coordinates = CoordinateIndex()  # rooms by row and column
+        self.version = 0  # bumped on every change, for caches built from the map
+        self.paths = None  # PathFinder, made on first find_path
+        
+        # validate_map state, kept current by add_room and connect_rooms
+        self._reset_components()
+        self.mismatches = 0  # connections whose target doesn't point straight back
+        self.validation_stale = False  # set when only a full recount can tell
+        
+    def add_room(self, name, description=None, x=None, y=None, room_type=None):
+        """Add a new room to the map"""
+        self.max_room_id += 1
+        if x is None or y is None:
+            # Assign random coordinates if not provided
+            x = self.rng.randint(-10, 10)
+            y = self.rng.randint(-10, 10)
+        
+        room = Room(self.max_room_id, name, description, x, y, self.rng)
+        if room_type:
+            room.room_type = room_type
+        self.rooms[self.max_room_id] = room
+        self.coordinates.add(room.id, x, y)
+        self._track_room(room.id)
+        return room.id
+
+    def move_room(self, room_id, x, y):
+        """Change a room's coordinates, keeping the coordinate index current"""
+        room = self.rooms[room_id]
+        self.coordinates.move(room_id, room.x, room.y, x, y)
+        room.x = x
+        room.y = y
+        self.version += 1
+        
+    def connect_rooms(self, room1_id, room2_id, direction):
+        """Connect two rooms in the given direction"""
+        # Add the connection in both rooms
+        if room1_id in self.rooms and room2_id in self.rooms:
+            room1 = self.rooms[room1_id]
+            room2 = self.rooms[room2_id]
+            opposite = OPPOSITE_DIRECTIONS[direction]
+            overwrite = direction in room1.connections or opposite in room2.connections
+            room1.add_connection(direction, room2_id)
+            room2.add_connection(opposite, room1_id)
+            self._track_connection(room1_id, room2_id, overwrite)
+            return True
+        return False
+        
+    def invalidate(self):
+        """Note changes made to rooms or connections without add_room/connect_rooms"""
+        self.version += 1
+        self.validation_stale = True
+        
+    def _reset_components(self):
+        self.components = DisjointSet()  # rooms joined by good connections
+        self.room_index = {}  # room_id: element in components
+        
+    def _index(self, room_id):
+        return self.room_index[room_id]
+        
+    def _track_room(self, room_id):
+        self.version += 1
+        if not self.validation_stale:
+            self.room_index[room_id] = self.components.add()
+            
+    def _track_connection(self, room1_id, room2_id, overwrite):
+        self.version += 1
+        if overwrite:
+            # the replaced corridor may have been holding two components
+            # together, which union-find can't undo
+            self.validation_stale = True
+        elif not self.validation_stale:
+            # both sides were free, so the new pair is reciprocal and no
+            # existing connection changes state
+            self.components.union(self._index(room1_id), self._index(room2_id))
+    
+    def find_path(self, start_id, goal_id):
+        """Route between two rooms as a tuple of room ids, or None
+        
+        The shortest by corridor length, except on maps big enough for
+        PathFinder to search hierarchically, where it is near optimal."""
+        if self.paths is None:
+            self.paths = PathFinder(self)
+        return self.paths.path(start_id, goal_id)
+    
+    def generate_connections(self, min_connections=1, max_connections=4):
+        """Connect rooms to create a cohesive map"""
+        if len(self.rooms) < 2:
+            return False
+            
+        room_ids = list(self.rooms.keys())
+        
+        # Start with a minimum spanning tree to ensure all rooms are connected.
+        # manhattan_mst only looks at O(n) candidate corridors instead of
+        # rescanning every connected/unconnected pair for each new room; it
+        # breaks ties between equally long corridors differently from that
+        # Prim loop, so grid maps can get other corridors of the same total
+        rooms = [self.rooms[room_id] for room_id in room_ids]
+        tree = manhattan_mst([(room.x, room.y) for room in rooms])
+        
+        for i, j in tree:
+            room1_id, room2_id = room_ids[i], room_ids[j]
+            room1 = rooms[i]
+            room2 = rooms[j]
+            
+            # Determine direction based on relative positions
+            if room1.x < room2.x:
+                direction = "east"
+            elif room1.x > room2.x:
+                direction = "west"
+            elif room1.y < room2.y:
+                direction = "north"
+            else:
+                direction = "south"
+            
+            # Connect the rooms
+            self.connect_rooms(room1_id, room2_id, direction)
+        
+        # Add additional random connections for complexity
+        additional_connections = self.rng.randint(0, len(self.rooms) // 2)
+        self.add_random_connections(additional_connections, room_ids)
+        
+        return True
+    
+    def add_random_connections(self, count, room_ids=None, rng=None):
+        """Add up to count extra corridors between rooms that line up"""
+        if rng is None:
+            rng = self.rng
+        if room_ids is None:
+            room_ids = list(self.rooms.keys())
+        opposite = {"north": "south", "south": "north", "east": "west", "west": "east"}
+        for _ in range(count):
+            room1_id = rng.choice(room_ids)
+            room1 = self.rooms[room1_id]
+            
+            available_directions = room1.get_available_directions()
+            if not available_directions:
+                continue
+                
+            direction = rng.choice(available_directions)
+            
+            # Find the nearest room in line with room1 in that direction
+            # that still has the opposite side free
+            for room2_id in self.coordinates.aligned(room1.x, room1.y, direction):
+                if opposite[direction] not in self.rooms[room2_id].connections:
+                    self.connect_rooms(room1_id, room2_id, direction)
+                    break
+    
+    def save(self, path):
+        """Write the map in the binary dungeon.format, ids must be 1..n"""
+        return save(compact_rooms(self.rooms), path)
+    
+    def print_map(self, file=None):
+        """Print a text representation of the map"""
+        # joined in batches of rooms, not one print per line
+        dungeon_export.dump(self.rooms, file)
+        
+    def export(self, path, format="text", compress=None):
+        """Write the map as text, jsonl or dot, gzipped for .gz paths"""
+        return dungeon_export.export(self.rooms, path, format, compress)
+            
+    def display_room(self, room_id):
+        """Return detailed information about a room"""
+        if room_id not in self.rooms:
+            return f"Room {room_id} not found."
+            
+        room = self.rooms[room_id]
+        lines = [
+            f"Room: {room.name} (ID: {room.id})",
+            f"Description: {room.description}",
+            f"Type: {room.room_type.capitalize()}",
+            "Exits:",
+        ]
+        
+        if not room.connections:
+            lines.append("  None (dead end)")
+        else:
+            for direction, connected_id in room.connections.items():
+                connected_room = self.rooms[connected_id]
+                lines.append(f"  {direction.capitalize()}: {connected_room.name} (ID: {connected_id})")
+                
+        lines.append("")
+        return "\n".join(lines)
+        
+    def validate_map(self, full=False):
+        """Verify that all rooms are reachable and connections are valid
+        
+        Components and mismatched connections are tracked as rooms are added
+        and connected, so this is O(1) after most edits. A recount runs after
+        a connection was overwritten or invalidate() was called; full=True
+        forces one, e.g. after editing Room.connections by hand."""
+        if full or self.validation_stale:
+            self._recount()
+        return self.components.components == 1 and self.mismatches == 0
+        
+    def _recount(self):
+        """Rebuild the validate_map state from every room's connections"""
+        self.room_index = {room_id: i for i, room_id in enumerate(self.rooms)}
+        self.components = DisjointSet(len(self.room_index))
+        self.mismatches = 0
+        
+        for room_id, room in self.rooms.items():
+            for direction, connected_id in room.connections.items():
+                connected_room = self.rooms.get(connected_id)
+                opposite = OPPOSITE_DIRECTIONS[direction]
+                if connected_room is None or connected_room.connections.get(opposite) != room_id:
+                    self.mismatches += 1
+                else:
+                    self.components.union(self._index(room_id), self._index(connected_id))
+        
+        self.validation_stale = False
+    
+    def generate_map_as_grid(self, grid_size=None):
+        """Generate room coordinates in a grid pattern"""
+        if not self.rooms:
+            return
+            
+        room_ids = list(self.rooms.keys())
+        num_rooms = len(room_ids)
+        
+        # Determine grid dimensions if not provided
+        if grid_size is None:
+            grid_side = math.ceil(math.sqrt(num_rooms))
+            grid_size = (grid_side, grid_side)
+            
+        max_x, max_y = grid_size
+        count = min(num_rooms, max_x * max_y)
+        
+        # Shuffle cell numbers for random assignment, cell y * max_x + x is
+        # (x, y); shuffle only looks at the length, so this is the order a
+        # shuffled list of (x, y) tuples would have
+        cells = list(range(max_x * max_y))
+        self.rng.shuffle(cells)
+        del cells[count:]
+        xs = [cell % max_x for cell in cells]
+        ys = [cell // max_x for cell in cells]
+        
+        self._place_rooms(room_ids[:count], xs, ys)
+        if count == num_rooms:
+            self.coordinates.rebuild_from(room_ids, xs, ys)
+        else:
+            # rooms past the end of the grid keep their coordinates
+            self.coordinates.rebuild(self.rooms)
+        self.version += 1
+        
+    def _place_rooms(self, room_ids, xs, ys):
+        """Set the coordinates of many rooms, the caller rebuilds the index"""
+        rooms = self.rooms
+        for room_id, x, y in zip(room_ids, xs, ys):
+            room = rooms[room_id]
+            room.x = x
+            room.y = y
+    
+    def visualize_with_pygame(self, scale=100, room_radius=30, window_size=(1200, 800)):
+        """Open an interactive pygame window on the map, see dungeon.view"""
+        # imported here so building maps (e.g. in worker processes) never loads pygame
+        from .view import visualize_with_pygame
+        visualize_with_pygame(self, scale, room_radius, window_size)
+
+
+class CompactDungeonMap(DungeonMap):
+    """DungeonMap whose rooms live in packed arrays (see dungeon.compact)
+    
+    self.rooms is a read-only view that hands out RoomView proxies, so the
+    generation, printing and drawing code shared with DungeonMap works as is
+    while each room costs a few dozen bytes instead of a Room object and dict."""
+    
+    def __init__(self, rng=None):
+        super().__init__(rng)
+        self.store = CompactRooms()
+        self.rooms = RoomsView(self.store)
+        self.read_only = False
+        
+    @classmethod
+    def load(cls, path):
+        """Open a saved map (or dumps() bytes) read-only, rooms are read on access
+        
+        The coordinate index is left empty, so loading takes the same time
+        for any map size; call coordinates.rebuild(rooms) if it is needed.
+        Anything that would change the map raises TypeError."""
+        dungeon = cls()
+        dungeon.store = MappedRooms(path)
+        dungeon.rooms = RoomsView(dungeon.store)
+        dungeon.max_room_id = len(dungeon.store)
+        dungeon.validation_stale = True
+        dungeon.read_only = True
+        return dungeon
+        
+    def _check_writable(self):
+        if self.read_only:
+            raise TypeError("dungeon maps opened with CompactDungeonMap.load are read-only")
+        
+    def save(self, path):
+        """Write the map in the binary dungeon.format"""
+        return save(self.store, path)
+        
+    def add_room(self, name, description=None, x=None, y=None, room_type=None):
+        """Add a new room to the map"""
+        self._check_writable()
+        if x is None or y is None:
+            # Assign random coordinates if not provided
+            x = self.rng.randint(-10, 10)
+            y = self.rng.randint(-10, 10)
+        
+        # draw the type even when one is given, like Room does, so both
+        # backends consume the same random numbers
+        chosen_type = self.rng.choice(ROOM_TYPES)
+        room_id = self.store.add(name, description, x, y, room_type or chosen_type)
+        self.max_room_id = room_id
+        self.coordinates.add(room_id, x, y)
+        self._track_room(room_id)
+        return room_id
+        
+    def move_room(self, room_id, x, y):
+        """Change a room's coordinates, keeping the coordinate index current"""
+        self._check_writable()
+        super().move_room(room_id, x, y)
+        
+    def connect_rooms(self, room1_id, room2_id, direction):
+        """Connect two rooms in the given direction"""
+        self._check_writable()
+        rooms = self.rooms
+        if room1_id in rooms and room2_id in rooms:
+            store = self.store
+            d = DIRECTION_INDEX[direction]
+            overwrite = (store.neighbour(room1_id, d) != NO_ROOM
+                         or store.neighbour(room2_id, (d + 2) % 4) != NO_ROOM)
+            store.set_neighbour(room1_id, d, room2_id)
+            store.set_neighbour(room2_id, (d + 2) % 4, room1_id)
+            self._track_connection(room1_id, room2_id, overwrite)
+            return True
+        return False
+        
+    def display_room(self, room_id):
+        """Return detailed information about a room"""
+        if room_id not in self.rooms:
+            return f"Room {room_id} not found."
+            
+        store = self.store
+        lines = [
+            f"Room: {store.name(room_id)} (ID: {room_id})",
+            f"Description: {store.description(room_id)}",
+            f"Type: {store.room_type(room_id).capitalize()}",
+            "Exits:",
+        ]
+        exits = [(direction, store.neighbour(room_id, d)) for d, direction in enumerate(DIRECTIONS)]
+        exits = [(direction, connected_id) for direction, connected_id in exits if connected_id != NO_ROOM]
+        if not exits:
+            lines.append("  None (dead end)")
+        for direction, connected_id in exits:
+            lines.append(f"  {direction.capitalize()}: {store.name(connected_id)} (ID: {connected_id})")
+        return "\n".join(lines) + "\n"
+        
+    def _reset_components(self):
+        self.components = DisjointSet(0, "I")  # element room_id - 1, no room_index
+        
+    def _index(self, room_id):
+        return room_id - 1
+        
+    def _place_rooms(self, room_ids, xs, ys):
+        # room ids run 1..n in store order, so the first len(room_ids)
+        # entries of the coordinate columns are overwritten in one go
+        self._check_writable()
+        count = len(room_ids)
+        self.store.xs[:count] = array("i", xs)
+        self.store.ys[:count] = array("i", ys)
+        
+    def _track_room(self, room_id):
+        self.version += 1
+        if not self.validation_stale:
+            self.components.add()
+            
+    def _recount(self):
+        """Rebuild the validate_map state straight from the adjacency array"""
+        n = len(self.store)
+        adjacency = self.store.adjacency
+        components = DisjointSet(n, "I")
+        mismatches = 0
+        
+        # Every connection must point at a room that points straight back
+        for slot in range(4 * n):
+            connected_id = adjacency[slot]
+            if connected_id == NO_ROOM:
+                continue
+            element, d = divmod(slot, 4)
+            if connected_id > n or adjacency[(connected_id - 1) * 4 + (d + 2) % 4] != element + 1:
+                mismatches += 1
+            else:
+                components.union(element, connected_id - 1)
+        
+        self.components = components
+        self.mismatches = mismatches
+        self.validation_stale = False
+
+
+def _zigzag(n):
+    """Map any integer onto a non-negative one (0, -1, 1, -2 ... -> 0, 1, 2, 3 ...)"""
+    return 2 * n if n >= 0 else -2 * n - 1
+
+
+def _unzigzag(n):
+    return n // 2 if n % 2 == 0 else -(n + 1) // 2
+
+
+def _pair(a, b):
+    """Cantor pairing of two non-negative integers"""
+    return (a + b) * (a + b + 1) // 2 + b
+
+
+def _unpair(n):
+    w = (math.isqrt(8 * n + 1) - 1) // 2
+    b = n - w * (w + 1) // 2
+    return w - b, b
+
+
+class ChunkedDungeon:
+    """An unbounded dungeon generated lazily in square chunks
+    
+    Every chunk is a chunk_size x chunk_size grid of rooms joined by a random
+    spanning tree plus a few loops, generated from the seed and the chunk
+    coordinates alone. Neighbouring chunks share one doorway per edge, chosen
+    from the seed and the edge, so corridors line up across the boundary no
+    matter which side is generated first. Only the max_chunks most recently
+    used chunks are kept; evicted chunks are regenerated identically.
+    """
+    
+    def __init__(self, seed=0, chunk_size=16, max_chunks=64, loop_chance=0.1):
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.loop_chance = loop_chance
+        self.chunks = OrderedDict()  # (cx, cy): DungeonMap, least recently used first
+        
+    def _rng(self, *key):
+        # string seeds are hashed with sha512, so this is stable across runs
+        return random.Random(":".join(str(part) for part in (self.seed,) + key))
+        
+    def room_id(self, x, y):
+        """Global id of the room at world coordinates (x, y)"""
+        size = self.chunk_size
+        cx, lx = divmod(x, size)
+        cy, ly = divmod(y, size)
+        chunk_index = _pair(_zigzag(cx), _zigzag(cy))
+        return chunk_index * size * size + ly * size + lx + 1
+        
+    def room_position(self, room_id):
+        """World coordinates of a room id, the inverse of room_id"""
+        size = self.chunk_size
+        chunk_index, local = divmod(room_id - 1, size * size)
+        a, b = _unpair(chunk_index)
+        ly, lx = divmod(local, size)
+        return _unzigzag(a) * size + lx, _unzigzag(b) * size + ly
+        
+    def doorway(self, cx, cy, side):
+        """Offset along the chunk edge where the corridor to the neighbour crosses"""
+        # both chunks sharing an edge must derive the same doorway from it
+        if side == "east":
+            key = ("v", cx, cy)
+        elif side == "west":
+            key = ("v", cx - 1, cy)
+        elif side == "north":
+            key = ("h", cx, cy)
+        else:
+            key = ("h", cx, cy - 1)
+        return self._rng(*key).randrange(self.chunk_size)
+        
+    def get_chunk(self, cx, cy):
+        """The chunk at chunk coordinates (cx, cy), generating it if needed"""
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.generate_chunk(cx, cy)
+            self.chunks[key] = chunk
+            while len(self.chunks) > self.max_chunks:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+        
+    def generate_chunk(self, cx, cy):
+        rng = self._rng("chunk", cx, cy)
+        size = self.chunk_size
+        chunk = DungeonMap(rng)
+        
+        # Rooms on every cell, ids derived from world coordinates
+        cells = []
+        for ly in range(size):
+            for lx in range(size):
+                x, y = cx * size + lx, cy * size + ly
+                name, desc, room_type = rng.choice(ROOM_TEMPLATES)
+                room = Room(self.room_id(x, y), name, desc, x, y, rng)
+                room.room_type = room_type
+                chunk.rooms[room.id] = room
+                chunk.coordinates.add(room.id, x, y)
+                cells.append(room.id)
+        chunk.max_room_id = max(cells)
+        chunk.invalidate()
+        
+        # Random spanning tree over neighbouring cells, a maze with no
+        # unreachable rooms, then a few extra corridors to make loops
+        edges = []
+        for ly in range(size):
+            for lx in range(size):
+                i = ly * size + lx
+                if lx + 1 < size:
+                    edges.append((rng.random(), i, i + 1))
+                if ly + 1 < size:
+                    edges.append((rng.random(), i, i + size))
+        tree = kruskal(size * size, edges)
+        in_tree = set(tree)
+        loops = [(i, j) for _, i, j in edges if (i, j) not in in_tree and rng.random() < self.loop_chance]
+        
+        for i, j in tree + loops:
+            direction = "east" if j == i + 1 else "north"
+            chunk.connect_rooms(cells[i], cells[j], direction)
+        
+        # Doorways to the four neighbours, only this side is stored here and
+        # the neighbour adds the reverse connection when it is generated
+        for side in ("east", "west", "north", "south"):
+            offset = self.doorway(cx, cy, side)
+            if side == "east":
+                x, y, dx, dy = size - 1, offset, 1, 0
+            elif side == "west":
+                x, y, dx, dy = 0, offset, -1, 0
+            elif side == "north":
+                x, y, dx, dy = offset, size - 1, 0, 1
+            else:
+                x, y, dx, dy = offset, 0, 0, -1
+            x += cx * size
+            y += cy * size
+            chunk.rooms[self.room_id(x, y)].add_connection(side, self.room_id(x + dx, y + dy))
+        
+        return chunk
+        
+    def room(self, room_id):
+        """The Room with this id, generating its chunk if needed"""
+        x, y = self.room_position(room_id)
+        return self.room_at(x, y)
+        
+    def room_at(self, x, y):
+        size = self.chunk_size
+        return self.get_chunk(x // size, y // size).rooms[self.room_id(x, y)]
+        
+    def load_around(self, x, y, radius=1):
+        """Make sure the chunks within radius chunks of (x, y) are loaded"""
+        size = self.chunk_size
+        cx, cy = x // size, y // size
+        for ny in range(cy - radius, cy + radius + 1):
+            for nx in range(cx - radius, cx + radius + 1):
+                self.get_chunk(nx, ny)
+                
+    def window(self, min_cx, min_cy, max_cx, max_cy):
+        """Copy the chunks in a rectangle into one regular DungeonMap
+        
+        Corridors leading out of the rectangle are dropped, so the result
+        can be validated and visualized like any generated map. The bounds
+        are inclusive chunk coordinates."""
+        if max_cx < min_cx or max_cy < min_cy:
+            raise ValueError(f"empty window ({min_cx}, {min_cy}) to ({max_cx}, {max_cy})")
+        window = DungeonMap(self._rng("window", min_cx, min_cy, max_cx, max_cy))
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                for room_id, room in self.get_chunk(cx, cy).rooms.items():
+                    copy = Room(room_id, room.name, room.description, room.x, room.y, window.rng)
+                    copy.room_type = room.room_type
+                    copy.connections = dict(room.connections)
+                    window.rooms[room_id] = copy
+                    window.coordinates.add(room_id, room.x, room.y)
+        for room in window.rooms.values():
+            room.connections = {direction: connected_id
+                                for direction, connected_id in room.connections.items()
+                                if connected_id in window.rooms}
+        window.max_room_id = max(window.rooms, default=0)
+        window.invalidate()
+        return window
+
+
+# Room descriptions
+ROOM_TEMPLATES = [
+    ("Entrance Hall", "A grand entrance with marble floors", "entrance"),
+    ("Long Hallway", "A dimly lit corridor", "common"),
+    ("Ritual Chamber", "A circular room with strange symbols", "boss"),
+    ("Ancient Library", "Shelves of dusty tomes line the walls", "common"),
+    ("Crypt", "A cold room with stone sarcophagi", "monster"),
+    ("Treasury", "Glittering gold and jewels", "treasure"),
+    ("Guard Room", "Weapons hang on the walls", "monster"),
+    ("Torture Chamber", "Rusty implements and dried blood", "trap"),
+    ("Dining Hall", "A long table with rotting food", "common"),
+    ("Kitchen", "Rusted utensils and a cold hearth", "common"),
+    ("Throne Room", "A magnificent chair sits atop a dais", "boss"),
+    ("Secret Passage", "A narrow, hidden corridor", "treasure"),
+    ("Armory", "Racks of weapons line the walls", "treasure"),
+    ("Barracks", "Rows of simple beds", "monster"),
+    ("Prison Cell", "Iron bars and chains", "trap"),
+    ("Alchemy Lab", "Strange liquids bubble in vials", "trap"),
+    ("Chapel", "An altar to forgotten gods", "common"),
+    ("Well Room", "A deep well in the center", "trap"),
+    ("Storage Room", "Crates and barrels fill the space", "common"),
+    ("Exit Passage", "A tunnel leading out", "exit")
+]
+
+
+def build_dungeon(seed, num_rooms=12, compact=True):
+    """A seeded map like create_sample_dungeon (tests/pygame-dungeon-map.py), without the printing
+    
+    Past len(ROOM_TEMPLATES) rooms the templates repeat in the same shuffled
+    order. Module level so generate_dungeons can send it to worker processes."""
+    rng = random.Random(seed)
+    dungeon = CompactDungeonMap(rng) if compact else DungeonMap(rng)
+    
+    templates = rng.sample(ROOM_TEMPLATES, len(ROOM_TEMPLATES))
+    for i in range(num_rooms):
+        name, desc, room_type = templates[i % len(templates)]
+        dungeon.add_room(name, desc, room_type=room_type)
+    
+    grid_side = math.ceil(math.sqrt(num_rooms))
+    dungeon.generate_map_as_grid((grid_side, grid_side))
+    dungeon.generate_connections()
+    return dungeon
+
+
+def generate_dungeons(seeds, num_rooms=12, max_workers=None, mp_context=None):
+    """Build one dungeon per seed across a process pool
+    
+    Returns dungeon_batch.BatchResult(seed, data, scores) per seed, where data
+    opens with CompactDungeonMap.load and scores has reachability, dead_ends
+    and branching. seeds can be any iterable. mp_context is passed on to
+    dungeon.batch.generate_batch."""
+    # listed up front, the chunk size depends on how many seeds there are
+    seeds = list(seeds)
+    return dungeon_batch.generate_batch(build_dungeon, seeds, max_workers=max_workers,
+                                        chunksize=max(1, len(seeds) // 64), mp_context=mp_context,
+                                        num_rooms=num_rooms)
+
+
+def dungeon_cache_key(seed, num_rooms):
+    """Hex digest of everything that decides what build_dungeon returns"""
+    key = f"{DUNGEON_GENERATOR_VERSION}:{FORMAT_VERSION}:{seed!r}:{num_rooms}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def load_dungeon(seed, num_rooms=12, cache_dir=DUNGEON_CACHE_DIR):
+    """build_dungeon(seed, num_rooms) from the on-disk cache, building it on a miss
+    
+    The map always comes back read-only, opened from the saved file, or from
+    the same saved bytes in memory when the cache can't be written, so a hit
+    and a miss behave the same. A cache file that can't be read is rebuilt
+    and replaced."""
+    path = os.path.join(cache_dir, f"dungeon-{dungeon_cache_key(seed, num_rooms)}.dgn")
+    try:
+        return CompactDungeonMap.load(path)
+    except (OSError, ValueError):
+        # missing, or truncated or corrupt and about to be overwritten
+        pass
+    
+    dungeon = build_dungeon(seed, num_rooms)
+    # write under a temporary name first, another run may be reading
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        dungeon.save(temp_path)
+        os.replace(temp_path, path)
+        return CompactDungeonMap.load(path)
+    except OSError:
+        # a read only checkout still gets the map, just not the cache
+        return CompactDungeonMap.load(dumps(dungeon.store))
+    finally:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
@@ -0,0 +1,367 @@
+"""Room to room routing over DungeonMap.rooms
+
+Corridors cost the Manhattan distance between the rooms they join, so the
+Manhattan distance to the goal never overestimates and A* stays exact.
+ClusterGraph adds a precomputed abstraction over square clusters of rooms
+(as in HPA*) for maps too big to search room by room, and PathFinder puts
+a cache in front of both that is dropped whenever the map's version changes.
+"""
+import heapq
+from collections import OrderedDict, defaultdict
+
+OPPOSITE_DIRECTIONS = {"north": "south", "south": "north", "east": "west", "west": "east"}
+
+MISSING = object()  # PathFinder cache miss
+
+
+def manhattan(room1, room2):
+    return abs(room1.x - room2.x) + abs(room1.y - room2.y)
+
+
+def path_cost(rooms, path):
+    """Total corridor length along a list of room ids"""
+    return sum(manhattan(rooms[a], rooms[b]) for a, b in zip(path, path[1:]))
+
+
+def _walk_back(came_from, room_id):
+    path = []
+    while room_id is not None:
+        path.append(room_id)
+        room_id = came_from[room_id]
+    path.reverse()
+    return path
+
+
+def astar(rooms, start, goal, within=None):
+    """Cheapest path from start to goal as a list of room ids, or None
+
+    within, if given, is a predicate on room ids that limits the search."""
+    if start not in rooms or goal not in rooms:
+        return None
+    goal_room = rooms[goal]
+    best = {start: 0}
+    came_from = {start: None}
+    heap = [(manhattan(rooms[start], goal_room), 0, start)]
+
+    while heap:
+        _, cost, current = heapq.heappop(heap)
+        if current == goal:
+            return _walk_back(came_from, goal)
+        if cost > best[current]:
+            continue
+        room = rooms[current]
+        for connected_id in room.connections.values():
+            if connected_id not in rooms or (within is not None and not within(connected_id)):
+                continue
+            connected_room = rooms[connected_id]
+            new_cost = cost + manhattan(room, connected_room)
+            if new_cost < best.get(connected_id, new_cost + 1):
+                best[connected_id] = new_cost
+                came_from[connected_id] = current
+                heapq.heappush(heap, (new_cost + manhattan(connected_room, goal_room), new_cost, connected_id))
+    return None
+
+
+def bidirectional_bfs(rooms, start, goal):
+    """Path with the fewest corridors from start to goal, or None
+
+    Searches from both ends at once, always growing the smaller frontier.
+    The goal side walks corridors backwards, which is only done where the
+    corridor is reciprocal (validate_map passes), one-way corridors are only
+    followed from the start side."""
+    if start not in rooms or goal not in rooms:
+        return None
+    if start == goal:
+        return [start]
+    forward = {start: None}
+    backward = {goal: None}
+    forward_frontier = [start]
+    backward_frontier = [goal]
+
+    while forward_frontier and backward_frontier:
+        grow_forward = len(forward_frontier) <= len(backward_frontier)
+        frontier = forward_frontier if grow_forward else backward_frontier
+        seen = forward if grow_forward else backward
+        other = backward if grow_forward else forward
+        next_frontier = []
+        for current in frontier:
+            for direction, connected_id in rooms[current].connections.items():
+                if connected_id in seen or connected_id not in rooms:
+                    continue
+                if not grow_forward and rooms[connected_id].connections.get(OPPOSITE_DIRECTIONS[direction]) != current:
+                    continue
+                seen[connected_id] = current
+                if connected_id in other:
+                    path = _walk_back(forward, connected_id)
+                    room_id = backward[connected_id]
+                    while room_id is not None:
+                        path.append(room_id)
+                        room_id = backward[room_id]
+                    return path
+                next_frontier.append(connected_id)
+        if grow_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+    return None
+
+
+def dijkstra(rooms, source, within=None):
+    """Exact costs and predecessors from source to every reachable room
+
+    Only rooms for which within(room_id) is true are entered when it is
+    given. Searches the whole map, so it is the reference astar is checked
+    against rather than a faster way to one goal."""
+    best = {source: 0}
+    came_from = {source: None}
+    heap = [(0, source)]
+    while heap:
+        cost, current = heapq.heappop(heap)
+        if cost > best[current]:
+            continue
+        room = rooms[current]
+        for connected_id in room.connections.values():
+            if connected_id not in rooms or (within is not None and not within(connected_id)):
+                continue
+            new_cost = cost + manhattan(room, rooms[connected_id])
+            if new_cost < best.get(connected_id, new_cost + 1):
+                best[connected_id] = new_cost
+                came_from[connected_id] = current
+                heapq.heappush(heap, (new_cost, connected_id))
+    return best, came_from
+
+
+class ClusterGraph:
+    """Precomputed abstract graph over cluster_size x cluster_size squares
+
+    Entrances are rooms with a corridor into another cluster. The abstract
+    graph joins entrances by those corridors and by the cheapest path inside
+    each cluster, so a query searches a few entrances per cluster instead of
+    every room. Paths are near optimal: the route between two entrances of
+    a cluster never leaves it. Like bidirectional_bfs it expects reciprocal
+    corridors, the goal's side of a route is found by searching from the goal.
+
+    Dungeons are mazes, where Manhattan distance badly underestimates, so
+    the abstract search also uses landmark bounds (ALT): distances from a
+    few far apart entrances bound the distance between any two others by
+    the triangle inequality."""
+
+    def __init__(self, rooms, cluster_size=16, landmarks=8):
+        self.rooms = rooms
+        self.cluster_size = cluster_size
+        self.cluster_of = {}
+        self.entrances = defaultdict(list)  # cluster: [room_id]
+        self.edges = defaultdict(dict)  # entrance: {entrance: (cost, [room_id])}
+
+        for room_id, room in rooms.items():
+            self.cluster_of[room_id] = (room.x // cluster_size, room.y // cluster_size)
+
+        cluster_of = self.cluster_of
+        for room_id, room in rooms.items():
+            cluster = cluster_of[room_id]
+            leaves = False
+            for connected_id in room.connections.values():
+                other = cluster_of.get(connected_id)
+                if other is not None and other != cluster:
+                    leaves = True
+                    self.edges[room_id][connected_id] = (manhattan(room, rooms[connected_id]), [room_id, connected_id])
+            if leaves:
+                self.entrances[cluster].append(room_id)
+
+        # inside a cluster, only keep entrance pairs whose path doesn't pass
+        # another entrance, the search gets those through the shorter pairs
+        for cluster, entrances in self.entrances.items():
+            for entrance in entrances:
+                best, came_from = self._local(entrance)
+                for other in entrances:
+                    if other != entrance and other in best:
+                        path = _walk_back(came_from, other)
+                        if not any(room_id in self.edges for room_id in path[1:-1]):
+                            self.edges[entrance][other] = (best[other], path)
+
+        self.landmark_distances = {}  # entrance: (distance from each landmark, -1 if unreachable)
+        self._pick_landmarks(landmarks)
+
+    def _abstract_distances(self, source):
+        best = {source: 0}
+        heap = [(0, source)]
+        edges = self.edges
+        while heap:
+            cost, current = heapq.heappop(heap)
+            if cost > best[current]:
+                continue
+            for connected_id, (step, _) in edges[current].items():
+                new_cost = cost + step
+                if new_cost < best.get(connected_id, new_cost + 1):
+                    best[connected_id] = new_cost
+                    heapq.heappush(heap, (new_cost, connected_id))
+        return best
+
+    def _pick_landmarks(self, count):
+        """Take count landmarks, each the entrance farthest from those before"""
+        if not self.edges or not count:
+            return
+        columns = []
+        nearest = self._abstract_distances(next(iter(self.edges)))
+        for _ in range(count):
+            landmark = max(nearest, key=nearest.get)
+            distances = self._abstract_distances(landmark)
+            if columns:
+                nearest = {node: min(cost, distances.get(node, cost)) for node, cost in nearest.items()}
+            else:
+                nearest = distances
+            columns.append(distances)
+        self.landmark_distances = {node: tuple(column.get(node, -1) for column in columns)
+                                   for node in self.edges}
+
+    def _local(self, room_id):
+        cluster = self.cluster_of[room_id]
+        cluster_of = self.cluster_of
+        return dijkstra(self.rooms, room_id, lambda other: cluster_of.get(other) == cluster)
+
+    def find(self, start, goal):
+        """Path from start to goal as a list of room ids, or None"""
+        rooms = self.rooms
+        if start not in rooms or goal not in rooms:
+            return None
+        start_cluster = self.cluster_of[start]
+        goal_cluster = self.cluster_of[goal]
+        if start_cluster == goal_cluster:
+            path = astar(rooms, start, goal, lambda other: self.cluster_of.get(other) == start_cluster)
+            if path is not None:
+                return path
+
+        # link start and goal to the entrances of their own clusters
+        start_best, start_came = self._local(start)
+        goal_best, goal_came = self._local(goal)
+        exits = {entrance: goal_best[entrance] for entrance in self.entrances[goal_cluster] if entrance in goal_best}
+        goal_room = rooms[goal]
+
+        # landmark distances of the goal, through its best exit
+        marks = self.landmark_distances
+        goal_marks = []
+        for k in range(len(next(iter(marks.values()), ()))):
+            through = [marks[exit][k] + cost for exit, cost in exits.items() if marks[exit][k] >= 0]
+            goal_marks.append(min(through) if through else -1)
+
+        def estimate(room_id):
+            bound = manhattan(rooms[room_id], goal_room)
+            for mark, goal_mark in zip(marks.get(room_id, ()), goal_marks):
+                if mark >= 0 and goal_mark >= 0 and abs(mark - goal_mark) > bound:
+                    bound = abs(mark - goal_mark)
+            return bound
+
+        best = {}
+        came_from = {}
+        heap = []
+        for entrance in self.entrances[start_cluster]:
+            if entrance in start_best:
+                best[entrance] = start_best[entrance]
+                came_from[entrance] = None
+                heapq.heappush(heap, (best[entrance] + estimate(entrance), best[entrance], entrance))
+
+        # A* over entrances; leaving through an exit of the goal cluster
+        # completes a route, and the search stops once nothing left on the
+        # heap can beat the best one
+        edges = self.edges
+        found_cost = None
+        via = None
+        while heap:
+            lower, cost, current = heapq.heappop(heap)
+            if found_cost is not None and lower >= found_cost:
+                break
+            if cost > best[current]:
+                continue
+            if current in exits and (found_cost is None or cost + exits[current] < found_cost):
+                found_cost = cost + exits[current]
+                via = current
+            for connected_id, (step, _) in edges[current].items():
+                new_cost = cost + step
+                if new_cost < best.get(connected_id, new_cost + 1):
+                    best[connected_id] = new_cost
+                    came_from[connected_id] = current
+                    heapq.heappush(heap, (new_cost + estimate(connected_id), new_cost, connected_id))
+
+        if via is None:
+            return None
+
+        # expand the abstract route back into rooms, the goal side was
+        # searched from the goal so its path is walked in reverse
+        segments = [_walk_back(goal_came, via)[::-1]]
+        current = via
+        while came_from[current] is not None:
+            previous = came_from[current]
+            segments.append(edges[previous][current][1][:-1])
+            current = previous
+        segments.append(_walk_back(start_came, current)[:-1])
+        return [room_id for segment in reversed(segments) for room_id in segment]
+
+
+class PathFinder:
+    """Cached routing for one DungeonMap
+
+    Results are kept in an LRU cache that is emptied whenever the map's
+    version changes, e.g. on connect_rooms. Maps with hierarchical_from rooms
+    or more are searched through a ClusterGraph, built on first use, and
+    their routes are near optimal rather than shortest.
+
+    Only cache hits are sub-millisecond. A first query costs a plain A* on
+    small maps, and around 7 ms through the ClusterGraph at 100k rooms: in a
+    maze the distance bounds are weak, so the abstract search still expands
+    about a thousand entrances. Paths come back as tuples, so callers can't
+    change what the cache holds."""
+
+    def __init__(self, dungeon, cluster_size=16, hierarchical_from=20000, cache_size=4096):
+        self.dungeon = dungeon
+        self.cluster_size = cluster_size
+        self.hierarchical_from = hierarchical_from
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # (kind, start, goal): path, least recently used first
+        self.clusters = None
+        self.version = dungeon.version
+
+    def _lookup(self, key):
+        # MISSING, not None, on a miss: None is a cached "no route"
+        if self.dungeon.version != self.version:
+            self.cache.clear()
+            self.clusters = None
+            self.version = self.dungeon.version
+            return MISSING
+        path = self.cache.get(key, MISSING)
+        if path is not MISSING:
+            self.cache.move_to_end(key)
+        return path
+
+    def _store(self, key, path):
+        if path is not None:
+            path = tuple(path)
+        self.cache[key] = path
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return path
+
+    def path(self, start, goal):
+        """Route by corridor length as a tuple of room ids, or None
+
+        Shortest below hierarchical_from rooms, near optimal (ClusterGraph)
+        from there on."""
+        key = ("path", start, goal)
+        path = self._lookup(key)
+        if path is MISSING:
+            rooms = self.dungeon.rooms
+            if len(rooms) >= self.hierarchical_from:
+                if self.clusters is None:
+                    self.clusters = ClusterGraph(rooms, self.cluster_size)
+                path = self.clusters.find(start, goal)
+            else:
+                path = astar(rooms, start, goal)
+            path = self._store(key, path)
+        return path
+
+    def hops(self, start, goal):
+        """Route with the fewest corridors as a tuple of room ids, or None"""
+        key = ("hops", start, goal)
+        path = self._lookup(key)
+        if path is MISSING:
+            path = self._store(key, bidirectional_bfs(self.dungeon.rooms, start, goal))
+        return path
@@ -0,0 +1,365 @@
+"""Interactive pygame viewer for DungeonMap, see DungeonMap.visualize_with_pygame"""
+from collections import OrderedDict
+
+import pygame
+
+from .index import GridIndex
+
+OPPOSITE_DIRECTIONS = {"north": "south", "south": "north", "east": "west", "west": "east"}
+
+# visualize_with_pygame camera: zoom factors applied to scale, the size of
+# the cached map tiles in pixels and how many of them are kept
+ZOOM_LEVELS = (0.125, 0.25, 0.5, 1, 2)
+TILE_SIZE = 256
+MAX_TILES = 160
+
+
+def visualize_with_pygame(dungeon, scale=100, room_radius=30, window_size=(1200, 800)):
+    """Create an interactive visualization using Pygame
+    
+    The window stays window_size for any map. Drag with the right or
+    middle mouse button or use the arrow keys to pan, the mouse wheel or
+    +/- to zoom, Home to recenter. The map is drawn in TILE_SIZE tiles
+    per zoom level, cached until the map changes, and each tile only
+    draws what a GridIndex over rooms and corridors finds inside it."""
+    pygame.init()
+    
+    if not dungeon.rooms:
+        print("No rooms to visualize.")
+        return
+    
+    # Find map dimensions
+    x_coords = [room.x for room in dungeon.rooms.values()]
+    y_coords = [room.y for room in dungeon.rooms.values()]
+    
+    min_x, max_x = min(x_coords), max(x_coords)
+    min_y, max_y = min(y_coords), max(y_coords)
+    
+    # Set up the display
+    width, height = window_size
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("Dungeon Map Visualization")
+    pygame.key.set_repeat(200, 30)
+    
+    # Room type to color mapping
+    room_colors = {
+        'common': (200, 200, 200),     # Light gray
+        'treasure': (255, 215, 0),     # Gold
+        'monster': (205, 92, 92),      # Indian Red
+        'trap': (139, 0, 0),           # Dark Red
+        'boss': (220, 20, 60),         # Crimson
+        'entrance': (34, 139, 34),     # Forest Green
+        'exit': (65, 105, 225)         # Royal Blue
+    }
+    
+    # Font setup
+    pygame.font.init()
+    font = pygame.font.SysFont('Arial', 12)
+    large_font = pygame.font.SysFont('Arial', 14, bold=True)
+    info_font = pygame.font.SysFont('Arial', 16)
+    
+    # Camera: the world point at the centre of the window and a zoom
+    # level; start on the closest zoom that fits the whole map
+    camera_x = (min_x + max_x) / 2
+    camera_y = (min_y + max_y) / 2
+    zoom = 0
+    for level, factor in enumerate(ZOOM_LEVELS):
+        if (max_x - min_x + 2) * scale * factor <= width and (max_y - min_y + 2) * scale * factor <= height:
+            zoom = level
+    
+    def origin():
+        """Map pixel at the window's top left corner for the current camera"""
+        unit = scale * ZOOM_LEVELS[zoom]
+        return round(camera_x * unit) - width // 2, round(camera_y * unit) - height // 2
+    
+    # Function to convert room coordinates to screen coordinates
+    def room_to_screen(room_x, room_y):
+        unit = scale * ZOOM_LEVELS[zoom]
+        origin_x, origin_y = origin()
+        return round(room_x * unit) - origin_x, round(room_y * unit) - origin_y
+    
+    def screen_to_world(screen_x, screen_y):
+        unit = scale * ZOOM_LEVELS[zoom]
+        return camera_x + (screen_x - width // 2) / unit, camera_y + (screen_y - height // 2) / unit
+    
+    def radius_at(level):
+        return max(2, round(room_radius * ZOOM_LEVELS[level]))
+    
+    def draw_room(surface, room_id, room, position, level, with_name=True):
+        screen_x, screen_y = position
+        radius = radius_at(level)
+        color = room_colors.get(room.room_type, (200, 200, 200))
+        
+        # Draw room circle
+        pygame.draw.circle(surface, color, (screen_x, screen_y), radius)
+        
+        # Labels only once they fit
+        if radius >= 12:
+            # Draw room ID
+            id_text = large_font.render(str(room_id), True, (0, 0, 0))
+            id_rect = id_text.get_rect(center=(screen_x, screen_y))
+            surface.blit(id_text, id_rect)
+        
+        if with_name:
+            draw_name(surface, room, position, level)
+    
+    def draw_name(surface, room, position, level):
+        if ZOOM_LEVELS[level] >= 1:
+            # Draw room name below
+            screen_x, screen_y = position
+            name_text = font.render(room.name, True, (255, 255, 255))
+            name_rect = name_text.get_rect(center=(screen_x, screen_y + radius_at(level) + 10))
+            surface.blit(name_text, name_rect)
+    
+    # Rooms and reciprocal corridor pairs bucketed in world coordinates,
+    # plus rooms alone in cells of one grid step for hit-testing
+    index = GridIndex(cell_size=8)
+    room_index = GridIndex(cell_size=1)
+    
+    def build_index():
+        index.clear()
+        room_index.clear()
+        for room_id, room in dungeon.rooms.items():
+            index.insert((room_id,), room.x, room.y)
+            room_index.insert(room_id, room.x, room.y)
+            for direction, connected_id in room.connections.items():
+                connected_room = dungeon.rooms[connected_id]
+                if connected_id < room_id and connected_room.connections.get(OPPOSITE_DIRECTIONS[direction]) == room_id:
+                    continue
+                index.insert((room_id, connected_id),
+                             min(room.x, connected_room.x), min(room.y, connected_room.y),
+                             max(room.x, connected_room.x), max(room.y, connected_room.y))
+    
+    def draw_tile(level, tile_x, tile_y):
+        """One TILE_SIZE square of the map at a zoom level, None if empty"""
+        factor = ZOOM_LEVELS[level]
+        unit = scale * factor
+        left = tile_x * TILE_SIZE
+        top = tile_y * TILE_SIZE
+        
+        # rooms just outside still reach in with their circle and name
+        margin = (radius_at(level) + 60) / unit
+        items = index.query(left / unit - margin, top / unit - margin,
+                            (left + TILE_SIZE) / unit + margin, (top + TILE_SIZE) / unit + margin)
+        if not items:
+            return None
+        
+        tile = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+        tile.fill((30, 30, 30))  # Dark background
+        
+        def to_tile(room):
+            return round(room.x * unit) - left, round(room.y * unit) - top
+        
+        # Draw connections between rooms
+        for item in items:
+            if len(item) == 2:
+                start = to_tile(dungeon.rooms[item[0]])
+                end = to_tile(dungeon.rooms[item[1]])
+                
+                # Draw corridor
+                pygame.draw.line(tile, (150, 150, 150), start, end, max(1, round(5 * factor)))
+                
+                # Draw little rectangle at midpoint to indicate doorway
+                door = max(2, round(10 * factor))
+                mid_x = (start[0] + end[0]) / 2
+                mid_y = (start[1] + end[1]) / 2
+                pygame.draw.rect(tile, (100, 100, 100), (mid_x - door / 2, mid_y - door / 2, door, door))
+        
+        # Draw rooms
+        for item in items:
+            if len(item) == 1:
+                room = dungeon.rooms[item[0]]
+                draw_room(tile, item[0], room, to_tile(room), level)
+        
+        return tile
+    
+    def room_at_screen(screen_x, screen_y):
+        """Room whose circle is under a window position, or None"""
+        radius = radius_at(zoom)
+        reach = radius / (scale * ZOOM_LEVELS[zoom])
+        world_x, world_y = screen_to_world(screen_x, screen_y)
+        
+        # only the cells a circle under the cursor could come from
+        for room_id in room_index.query(world_x - reach, world_y - reach, world_x + reach, world_y + reach):
+            room = dungeon.rooms[room_id]
+            room_x, room_y = room_to_screen(room.x, room.y)
+            if (screen_x - room_x) ** 2 + (screen_y - room_y) ** 2 <= radius * radius:
+                return room_id
+        return None
+    
+    def draw_ring(room_id, color):
+        room = dungeon.rooms[room_id]
+        position = room_to_screen(room.x, room.y)
+        ring = radius_at(zoom) + max(2, round(5 * ZOOM_LEVELS[zoom]))
+        ring_rect = pygame.draw.circle(screen, color, position, ring)
+        draw_room(screen, room_id, room, position, zoom, with_name=False)
+        
+        # the ring reaches over the top of the name, which is already on
+        # the tile; blit it again, only inside the ring's bounds, so the
+        # rest of the text isn't blended twice
+        screen.set_clip(ring_rect)
+        draw_name(screen, room, position, zoom)
+        screen.set_clip(None)
+    
+    def draw_legend():
+        legend = pygame.Surface((140, 200), pygame.SRCALPHA)
+        legend.fill((50, 50, 50, 230))
+        
+        legend_title = info_font.render("Room Types", True, (255, 255, 255))
+        legend.blit(legend_title, (10, 10))
+        
+        for i, (room_type, color) in enumerate(room_colors.items()):
+            y_pos = 40 + i * 20
+            pygame.draw.circle(legend, color, (20, y_pos), 8)
+            type_text = font.render(room_type.capitalize(), True, (255, 255, 255))
+            legend.blit(type_text, (35, y_pos - 7))
+        return legend
+    
+    def draw_info_panel(room_info):
+        # Create a semi-transparent info panel
+        info_surface = pygame.Surface((350, 200))
+        info_surface.set_alpha(230)
+        info_surface.fill((50, 50, 50))
+        
+        # Render room information once, it is blitted on every redraw
+        lines = room_info.strip().split('\n')
+        line_height = 24
+        blits = [(info_surface, (20, 20))]
+        for i, line in enumerate(lines):
+            info_text = info_font.render(line, True, (255, 255, 255))
+            blits.append((info_text, (30, 30 + i * line_height)))
+        return blits
+    
+    # Main visualization loop
+    clock = pygame.time.Clock()
+    running = True
+    room_info = ""
+    info_panel = None
+    legend = draw_legend()
+    tiles = OrderedDict()  # (zoom, tile_x, tile_y): Surface or None, least recently used first
+    tiles_version = None
+    dragging = False
+    hovered_room = None
+    hover_camera = None  # camera the hover hit-test was done for
+    redraw = True
+    
+    while running:
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                redraw = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (2, 3):
+                dragging = True
+            elif event.type == pygame.MOUSEBUTTONUP and event.button in (2, 3):
+                dragging = False
+            elif event.type == pygame.MOUSEMOTION and dragging:
+                unit = scale * ZOOM_LEVELS[zoom]
+                camera_x -= event.rel[0] / unit
+                camera_y -= event.rel[1] / unit
+                redraw = True
+            elif event.type == pygame.MOUSEMOTION:
+                # Hover highlight, the screen is only redrawn when it moves
+                room_id = room_at_screen(*event.pos)
+                if room_id != hovered_room:
+                    hovered_room = room_id
+                    redraw = True
+            elif event.type == pygame.MOUSEWHEEL:
+                # zoom about the cursor, the world point under it stays put
+                new_zoom = min(max(zoom + event.y, 0), len(ZOOM_LEVELS) - 1)
+                if new_zoom != zoom:
+                    mouse_x, mouse_y = pygame.mouse.get_pos()
+                    world_x, world_y = screen_to_world(mouse_x, mouse_y)
+                    zoom = new_zoom
+                    unit = scale * ZOOM_LEVELS[zoom]
+                    camera_x = world_x - (mouse_x - width // 2) / unit
+                    camera_y = world_y - (mouse_y - height // 2) / unit
+                    redraw = True
+            elif event.type == pygame.KEYDOWN:
+                step = 100 / (scale * ZOOM_LEVELS[zoom])
+                if event.key == pygame.K_LEFT:
+                    camera_x -= step
+                elif event.key == pygame.K_RIGHT:
+                    camera_x += step
+                elif event.key == pygame.K_UP:
+                    camera_y -= step
+                elif event.key == pygame.K_DOWN:
+                    camera_y += step
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    zoom = min(zoom + 1, len(ZOOM_LEVELS) - 1)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    zoom = max(zoom - 1, 0)
+                elif event.key == pygame.K_HOME:
+                    camera_x = (min_x + max_x) / 2
+                    camera_y = (min_y + max_y) / 2
+                redraw = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                # Check if a room was clicked
+                room_id = room_at_screen(*pygame.mouse.get_pos())
+                if room_id is not None:
+                    dungeon.selected_room = room_id
+                    room_info = dungeon.display_room(room_id)
+                    info_panel = draw_info_panel(room_info)
+                    redraw = True
+        
+        # The map only changes through DungeonMap methods, which bump
+        # the version, so the index and tiles are rebuilt only then
+        if tiles_version != dungeon.version:
+            hover_camera = None
+            build_index()
+            tiles.clear()
+            tiles_version = dungeon.version
+            if dungeon.selected_room in dungeon.rooms:
+                room_info = dungeon.display_room(dungeon.selected_room)
+                info_panel = draw_info_panel(room_info)
+            redraw = True
+        
+        # A pan or zoom moves the map under a still cursor, so hit-test
+        # the hover again whenever the camera (or the map) changed
+        if hover_camera != (camera_x, camera_y, zoom):
+            hover_camera = (camera_x, camera_y, zoom)
+            room_id = room_at_screen(*pygame.mouse.get_pos()) if pygame.mouse.get_focused() else None
+            if room_id != hovered_room:
+                hovered_room = room_id
+                redraw = True
+        
+        if redraw:
+            screen.fill((30, 30, 30))
+            
+            # Only the tiles overlapping the window are drawn
+            origin_x, origin_y = origin()
+            for tile_y in range(origin_y // TILE_SIZE, (origin_y + height - 1) // TILE_SIZE + 1):
+                for tile_x in range(origin_x // TILE_SIZE, (origin_x + width - 1) // TILE_SIZE + 1):
+                    key = (zoom, tile_x, tile_y)
+                    if key in tiles:
+                        tiles.move_to_end(key)
+                        tile = tiles[key]
+                    else:
+                        tile = tiles[key] = draw_tile(zoom, tile_x, tile_y)
+                        while len(tiles) > MAX_TILES:
+                            tiles.popitem(last=False)
+                    if tile is not None:
+                        screen.blit(tile, (tile_x * TILE_SIZE - origin_x, tile_y * TILE_SIZE - origin_y))
+            
+            # Draw highlighted circle if hovered or selected, then the
+            # room and its name again on top; the info panel and legend
+            # come after, so a ring never covers them
+            if hovered_room in dungeon.rooms and hovered_room != dungeon.selected_room:
+                draw_ring(hovered_room, (120, 120, 120))
+            if dungeon.selected_room in dungeon.rooms:
+                draw_ring(dungeon.selected_room, (255, 255, 255))
+            
+            # Display room information if a room is selected
+            if dungeon.selected_room is not None and room_info:
+                screen.blits(info_panel)
+            
+            # Draw legend
+            screen.blit(legend, (width - 160, 20))
+            
+            pygame.display.flip()
+            redraw = False
+        
+        clock.tick(30)
+    
+    pygame.quit()
@@ -0,0 +1,129 @@
+from array import array
+
+#small int codes for the string states, index in the tuple is the code
+DIRECTIONS = ("left", "right", "up", "down")
+STATUSES = ("idle", "walk", "run")
+
+#inputs are a bitmask per entity
+INPUT_BITS = {"left": 1, "right": 2, "up": 4, "down": 8}
+
+IDLE = 0
+WALK = 1
+RUN = 2
+
+
+class EntityStore:
+    """Every entity's state in parallel arrays, an entity is just an index"""
+
+    def __init__(self):
+        self.x = array("d")
+        self.y = array("d")
+        self.vx = array("d")
+        self.vy = array("d")
+        self.speed = array("d")
+        self.health = array("i")
+        self.maxHealth = array("i")
+        self.stamina = array("i")
+        self.maxStamina = array("i")
+        self.status = array("b")
+        self.direction = array("b")
+        self.inputs = array("B")
+        self.sprint = array("b")
+        self.collided = array("b")
+        self.regen = array("b")
+        self.lastStamTick = array("d")
+
+    def __len__(self):
+        return len(self.x)
+
+    def add(self, x, y, direction="up", speed=5, health=100, stamina=50):
+        index = len(self.x)
+        self.x.append(x)
+        self.y.append(y)
+        self.vx.append(0)
+        self.vy.append(0)
+        self.speed.append(speed)
+        self.health.append(health)
+        self.maxHealth.append(health)
+        self.stamina.append(stamina)
+        self.maxStamina.append(stamina)
+        self.status.append(IDLE)
+        self.direction.append(DIRECTIONS.index(direction))
+        self.inputs.append(0)
+        self.sprint.append(0)
+        self.collided.append(0)
+        self.regen.append(0)
+        self.lastStamTick.append(0)
+        return index
+
+
+def steerAll(store):
+    #velocity from held inputs, then status from velocity
+    inputs = store.inputs
+    vx = store.vx
+    vy = store.vy
+    status = store.status
+    sprint = store.sprint
+    for i in range(len(inputs)):
+        held = inputs[i]
+        vx[i] = ((held >> 1) & 1) - (held & 1)
+        vy[i] = ((held >> 3) & 1) - ((held >> 2) & 1)
+        if vx[i] == 0 and vy[i] == 0:
+            status[i] = IDLE
+        elif sprint[i]:
+            status[i] = RUN
+        else:
+            status[i] = WALK
+
+
+def regenAll(store, now, cooldown, sprintMult=1.5):
+    """Drain stamina while sprinting, regen it after cooldown ms of rest
+
+    Returns the speed multiplier of every entity for this step"""
+    mult = array("d", [1.0]) * len(store.x)
+    stamina = store.stamina
+    maxStamina = store.maxStamina
+    sprint = store.sprint
+    regen = store.regen
+    lastStamTick = store.lastStamTick
+    for i in range(len(stamina)):
+        if sprint[i]:
+            if stamina[i] > 0:
+                mult[i] = sprintMult
+                stamina[i] -= 1
+        elif stamina[i] < maxStamina[i] and now - lastStamTick[i] >= cooldown:
+            regen[i] = 1
+            lastStamTick[i] = now
+
+        if stamina[i] >= maxStamina[i]:
+            regen[i] = 0
+        if regen[i]:
+            stamina[i] += 1
+    return mult
+
+
+def moveAll(store, mult):
+    x = store.x
+    y = store.y
+    vx = store.vx
+    vy = store.vy
+    speed = store.speed
+    for i in range(len(x)):
+        step = speed[i] * mult[i]
+        x[i] += vx[i] * step
+        y[i] += vy[i] * step
+
+
+def clampAll(store, left, top, right, bottom):
+    #keep positions inside the level and stats inside their ranges
+    x = store.x
+    y = store.y
+    health = store.health
+    maxHealth = store.maxHealth
+    stamina = store.stamina
+    maxStamina = store.maxStamina
+    for i in range(len(x)):
+        x[i] = min(max(x[i], left), right)
+        y[i] = min(max(y[i], top), bottom)
+        health[i] = min(max(health[i], 0), maxHealth[i])
+        stamina[i] = min(max(stamina[i], 0), maxStamina[i])
@@ -0,0 +1,249 @@
+import os
+import sys
+import time
+
+import pygame
+
+import animations
+import atlas
+import collision
+import entities
+import hud
+import player
+from profiler import FrameProfiler
+import renderer
+import timestep
+
+# CONSTANTS
+WIDTH = 1200
+HEIGHT = 800
+FPS = 60
+
+#simulation runs in fixed steps of SIM_STEP ms no matter what the frame rate is
+SIM_STEP = 1000 / 60
+MAX_STEPS = 5
+
+#hp
+tickCooldown = 300
+#stam
+stamCooldown = 2000
+
+BG = (50, 50, 50)
+BLACK = (0, 0, 0)
+RED = (255, 0 ,0)
+GREEN = (0,255, 0)
+BLUE = (0,0,255)
+
+
+class Game:
+    """One level: loading, fixed step simulation and drawing
+
+    The loop is split into phases (events, simulation, collision, animation,
+    blit, present), each wrapped in profiler.phase(name) so they can be timed.
+    F3 toggles the frame time overlay, F4 dumps a Chrome trace"""
+
+    def __init__(self, screen, profiler=None, maxSteps=MAX_STEPS):
+        self.screen = screen
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.running = True
+
+        #load assets
+        self.frameAtlas = atlas.load()
+
+        #animations, frame data is shared and each entity only keeps a cursor
+        self.animationRegistry = animations.loadRegistry(self.frameAtlas)
+
+        bg = pygame.image.load(os.path.join(atlas.ASSET_DIR, "pixil.png")).convert()
+        bg = pygame.transform.scale(bg, (1200,800))
+
+        #every character lives in the entity store, Player is a view into it
+        self.world = entities.EntityStore()
+
+        #player
+        self.character = player.Player(100,100, "up", 5, self.world)
+        self.playerAnimation = self.animationRegistry.cursor(self.character.status, self.character.direction)
+        self.col = RED
+        self.lastDamage = 0
+
+        #death cube
+        self.redCube = pygame.Rect(700, 340, 25, 25)
+        #wall
+        self.wall = pygame.Rect(900,500, 100, 25)
+        #
+        self.topWall = pygame.Rect(0,0, 1200, 65)
+        self.bottomWall = pygame.Rect(0,760, 1200, 40)
+        self.leftWall = pygame.Rect(0,0, 50, 800)
+        self.rightWall = pygame.Rect(1150,0, 50, 800)
+
+        #collision worlds are built once, the loop only queries them
+        self.wallWorld = collision.SpatialHash()
+        for object in [self.topWall, self.bottomWall, self.leftWall, self.rightWall]:
+            self.wallWorld.insert(object)
+
+        self.hazardWorld = collision.SpatialHash()
+        self.hazardWorld.insert(self.redCube)
+
+        #static layer, everything that never moves is drawn once here
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(BG)
+        background.blit(bg, (0,0))
+        pygame.draw.rect(background, BLACK, self.topWall)
+
+        self.frameRenderer = renderer.Renderer(screen, background)
+
+        #health and stamina bars
+        self.playerHud = hud.Hud()
+        self.playerHud.add("health", hud.Bar((600,695), RED))
+        self.playerHud.add("stamina", hud.Bar((600,750), BLUE))
+
+        self.simClock = timestep.FixedTimestep(SIM_STEP, maxSteps)
+
+        #position at the start of the last step, for interpolated drawing
+        self.prevX = self.character.playerX
+        self.prevY = self.character.playerY
+
+    def checkInput(self, key, value):
+        if key == pygame.K_a:
+            self.character.inputs["left"] = value
+        elif key == pygame.K_d:
+            self.character.inputs["right"] = value
+        elif key == pygame.K_w:
+            self.character.inputs["up"] = value
+        elif key == pygame.K_s:
+            self.character.inputs["down"] = value
+
+    def setDirection(self, key, currentDirection):
+        if key == pygame.K_a:
+            return "left"
+        elif key == pygame.K_d:
+            return "right"
+        elif key == pygame.K_w:
+            return "up"
+        elif key == pygame.K_s:
+            return "down"
+
+        return currentDirection
+
+    def handleEvents(self, events):
+        character = self.character
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                elif event.key == pygame.K_F4:
+                    self.dumpTrace()
+                self.checkInput(event.key, True)
+                if event.key == pygame.K_LSHIFT:
+                    character.sprint = True
+
+                character.direction = self.setDirection(event.key, character.direction)
+            elif event.type == pygame.KEYUP:
+                self.checkInput(event.key, False)
+                if event.key == pygame.K_LSHIFT:
+                    character.sprint = False
+
+    def dumpTrace(self):
+        #only while F3 timing is on and something was timed, a failed write
+        #is reported and the game keeps running
+        profiler = self.profiler
+        if not profiler.enabled or not profiler.spanCount:
+            return None
+        try:
+            return profiler.dumpTrace(f"trace-{int(time.time())}.json")
+        except OSError as error:
+            print(f"could not write frame trace: {error}", file=sys.stderr)
+            return None
+
+    def simulate(self, now):
+        profiler = self.profiler
+        character = self.character
+        world = self.world
+
+        with profiler.phase("simulation"):
+            playerCollisionBox = pygame.Rect(character.playerX + 1, character.playerY + 1, 62, 62)
+
+            #every entity in one pass
+            entities.steerAll(world)
+            mult = entities.regenAll(world, now, stamCooldown)
+
+        with profiler.phase("collision"):
+            self.col = RED
+
+            #collision checker
+            collision.slideAll(world, mult, self.wallWorld)
+
+            for object in self.hazardWorld.collideAll(playerCollisionBox):
+                self.col = GREEN
+                if now - self.lastDamage >= tickCooldown:
+                    if character.health >= 0:
+                        character.health -= 5
+                        self.lastDamage = now
+
+        with profiler.phase("animation"):
+            #update animatiion
+            self.playerAnimation.play(self.animationRegistry.get(character.status, character.direction))
+            self.playerAnimation.advance(SIM_STEP)
+
+        with profiler.phase("simulation"):
+            #movement
+            entities.moveAll(world, mult)
+            entities.clampAll(world, 0, 0, WIDTH - 64, HEIGHT - 64)
+
+    def draw(self):
+        character = self.character
+
+        with self.profiler.phase("animation"):
+            self.playerAnimation.play(self.animationRegistry.get(character.status, character.direction))
+            image = self.playerAnimation.image()
+
+        with self.profiler.phase("blit"):
+            #draw between the last two simulated positions
+            alpha = self.simClock.alpha()
+            drawX = self.prevX + (character.playerX - self.prevX) * alpha
+            drawY = self.prevY + (character.playerY - self.prevY) * alpha
+
+            #stamina + healthbars, only re-rendered when the value changes
+            for rect in self.playerHud.update(health=character.health, stamina=character.stamina):
+                self.frameRenderer.markDirty(rect)
+
+            #DEATH cube
+            self.frameRenderer.rect("cube", self.col, self.redCube)
+
+            #draw player
+            self.frameRenderer.blit("player", image, (drawX, drawY))
+
+            #draw healthbars
+            self.playerHud.draw(self.frameRenderer)
+
+            if self.profiler.overlay:
+                graph = self.profiler.drawOverlay()
+                pos = (WIDTH - graph.get_width() - 60, 75)
+                self.frameRenderer.blit("profiler", graph, pos)
+                self.frameRenderer.markDirty(graph.get_rect(topleft=pos))
+
+            dirty = self.frameRenderer.compose()
+
+        with self.profiler.phase("present"):
+            if dirty:
+                pygame.display.update(dirty)
+
+    def frame(self, frameTime, events):
+        """Run one rendered frame, frameTime is the real time since the last one in ms"""
+        with self.profiler.phase("events"):
+            self.handleEvents(events)
+
+        for now in self.simClock.steps(frameTime):
+            self.prevX = self.character.playerX
+            self.prevY = self.character.playerY
+            self.simulate(now)
+
+        self.draw()
+        self.profiler.endFrame()
+        return self.running
+
+    def run(self, clock):
+        while self.running:
+            frameTime = clock.tick(FPS)
+            self.frame(frameTime, pygame.event.get())
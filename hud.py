@@ -0,0 +1,101 @@
+from collections import OrderedDict
+
+import pygame
+
+BLACK = (0, 0, 0)
+
+
+class GlyphCache:
+    """Memoized font.render results, least recently used strings are dropped"""
+
+    def __init__(self, size=256):
+        self.size = size
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, colour, antialias=True):
+        key = (font, text, colour, antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, colour)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.size:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+glyphs = GlyphCache()
+
+
+class Bar:
+    #value * unit wide bar inside a black border, centred on center
+    def __init__(self, center, colour, unit=5, height=40, border=5, borderColour=BLACK):
+        self.center = center
+        self.colour = colour
+        self.unit = unit
+        self.height = height
+        self.border = border
+        self.borderColour = borderColour
+        self.value = None
+        self.surface = None
+        self.rect = pygame.Rect(center, (0, 0))
+
+    def update(self, value):
+        if value == self.value:
+            return False
+        self.value = value
+
+        width = max(0, value * self.unit)
+        self.surface = pygame.Surface((width + self.border * 2, self.height + self.border * 2))
+        self.surface.fill(self.borderColour)
+        self.surface.fill(self.colour, (self.border, self.border, width, self.height))
+        self.rect = self.surface.get_rect(center=self.center)
+        return True
+
+
+class Text:
+    def __init__(self, font, pos, colour=(255, 255, 255), cache=glyphs):
+        self.font = font
+        self.pos = pos
+        self.colour = colour
+        self.cache = cache
+        self.value = None
+        self.surface = None
+        self.rect = pygame.Rect(pos, (0, 0))
+
+    def update(self, value):
+        value = str(value)
+        if value == self.value:
+            return False
+        self.value = value
+        self.surface = self.cache.render(self.font, value, self.colour)
+        self.rect = self.surface.get_rect(topleft=self.pos)
+        return True
+
+
+class Hud:
+    """Named widgets that only re-render when the value they show changes"""
+
+    def __init__(self):
+        self.widgets = {}
+
+    def add(self, key, widget):
+        self.widgets[key] = widget
+        return widget
+
+    def update(self, **values):
+        #returns the screen rects that changed, old and new position
+        dirty = []
+        for key, value in values.items():
+            widget = self.widgets[key]
+            old = widget.rect.copy()
+            if widget.update(value):
+                dirty.append(old)
+                dirty.append(widget.rect)
+        return dirty
+
+    def draw(self, frameRenderer):
+        for key, widget in self.widgets.items():
+            if widget.surface is not None:
+                frameRenderer.blit(key, widget.surface, widget.rect.topleft)
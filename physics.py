@@ -0,0 +1,58 @@
+import numpy as np
+
+#cap on entity x wall pairs tested at once, keeps the temporaries small
+PAIR_BUDGET = 1 << 20
+
+
+def wallArray(rects):
+    """(M, 4) left, top, right, bottom array from pygame rects"""
+    return np.array([(r.left, r.top, r.right, r.bottom) for r in rects], dtype=np.float64).reshape(-1, 4)
+
+
+def overlapsAny(left, top, size, walls):
+    #same test as Rect.colliderect for size x size boxes, any wall per box
+    hit = np.zeros(len(left), dtype=bool)
+    if not len(walls):
+        return hit
+
+    chunk = max(1, PAIR_BUDGET // len(walls))
+    wl, wt, wr, wb = walls[:, 0], walls[:, 1], walls[:, 2], walls[:, 3]
+    for start in range(0, len(left), chunk):
+        l = left[start:start + chunk, None]
+        t = top[start:start + chunk, None]
+        hit[start:start + chunk] = ((l < wr) & (l + size > wl) & (t < wb) & (t + size > wt)).any(axis=1)
+    return hit
+
+
+def slideBoxes(left, top, moveX, moveY, size, walls):
+    """Zero each axis of (moveX, moveY) that would push its box into a wall
+
+    left and top are the integer box corners, like the scalar path the box is
+    tested on each axis separately from its current position"""
+    hitY = overlapsAny(left, np.trunc(top + moveY), size, walls)
+    hitX = overlapsAny(np.trunc(left + moveX), top, size, walls)
+    return hitX, hitY
+
+
+def stepStore(store, mult, walls, offset=1, size=62):
+    """Slide and move every entity in an EntityStore at once
+
+    Works on the store's arrays in place through zero-copy numpy views, so it
+    is a drop in for collision.slideAll followed by entities.moveAll"""
+    if not len(store):
+        return
+
+    x = np.frombuffer(store.x, dtype=np.float64)
+    y = np.frombuffer(store.y, dtype=np.float64)
+    vx = np.frombuffer(store.vx, dtype=np.float64)
+    vy = np.frombuffer(store.vy, dtype=np.float64)
+    step = np.frombuffer(store.speed, dtype=np.float64) * np.asarray(mult, dtype=np.float64)
+
+    left = np.trunc(x + offset)
+    top = np.trunc(y + offset)
+    hitX, hitY = slideBoxes(left, top, vx * step, vy * step, size, walls)
+    vx[hitX] = 0
+    vy[hitY] = 0
+
+    x += vx * step
+    y += vy * step
@@ -1,19 +1,144 @@
+import entities
+
+
+class VelocityView:
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, axis):
+        return (self.store.vx, self.store.vy)[axis][self.index]
+
+    def __setitem__(self, axis, value):
+        (self.store.vx, self.store.vy)[axis][self.index] = value
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        yield self.store.vx[self.index]
+        yield self.store.vy[self.index]
+
+
+class InputView:
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, name):
+        return bool(self.store.inputs[self.index] & entities.INPUT_BITS[name])
+
+    def __setitem__(self, name, value):
+        bit = entities.INPUT_BITS[name]
+        if value:
+            self.store.inputs[self.index] |= bit
+        else:
+            self.store.inputs[self.index] &= ~bit
+
+    def keys(self):
+        return entities.INPUT_BITS.keys()
+
+
 class Player:
+    """View of one entity in an EntityStore, keeps the old attribute API"""
+    __slots__ = ("store", "index", "velocity", "inputs")
+
+    def __init__(self , x, y, initDirection, speed, store=None):
+        if store is None:
+            store = entities.EntityStore()
+        self.store = store
+        self.index = store.add(x, y, initDirection, speed)
+        self.velocity = VelocityView(store, self.index)
+        self.inputs = InputView(store, self.index)
+
+    @property
+    def playerX(self):
+        return self.store.x[self.index]
+
+    @playerX.setter
+    def playerX(self, value):
+        self.store.x[self.index] = value
+
+    @property
+    def playerY(self):
+        return self.store.y[self.index]
+
+    @playerY.setter
+    def playerY(self, value):
+        self.store.y[self.index] = value
+
+    @property
+    def direction(self):
+        return entities.DIRECTIONS[self.store.direction[self.index]]
+
+    @direction.setter
+    def direction(self, value):
+        self.store.direction[self.index] = entities.DIRECTIONS.index(value)
+
+    @property
+    def status(self):
+        return entities.STATUSES[self.store.status[self.index]]
+
+    @status.setter
+    def status(self, value):
+        self.store.status[self.index] = entities.STATUSES.index(value)
+
+    @property
+    def sprint(self):
+        return bool(self.store.sprint[self.index])
+
+    @sprint.setter
+    def sprint(self, value):
+        self.store.sprint[self.index] = bool(value)
+
+    @property
+    def speed(self):
+        return self.store.speed[self.index]
+
+    @speed.setter
+    def speed(self, value):
+        self.store.speed[self.index] = value
+
+    @property
+    def health(self):
+        return self.store.health[self.index]
+
+    @health.setter
+    def health(self, value):
+        self.store.health[self.index] = value
+
+    @property
+    def maxHealth(self):
+        return self.store.maxHealth[self.index]
+
+    @maxHealth.setter
+    def maxHealth(self, value):
+        self.store.maxHealth[self.index] = value
+
+    @property
+    def stamina(self):
+        return self.store.stamina[self.index]
+
+    @stamina.setter
+    def stamina(self, value):
+        self.store.stamina[self.index] = value
+
+    @property
+    def maxStamina(self):
+        return self.store.maxStamina[self.index]
+
+    @maxStamina.setter
+    def maxStamina(self, value):
+        self.store.maxStamina[self.index] = value
+
+    @property
+    def collided(self):
+        return bool(self.store.collided[self.index])
 
-    def __init__(self , x, y, initDirection, speed):
-        self.playerX = x
-        self.playerY = y
-        self.inputs = {"left": False,
-                       "right": False,
-                       "up": False,
-                       "down": False}
-        self.velocity = [0,0]
-        self.direction = initDirection
-        self.status = "idle"
-        self.sprint = False
-        self.speed = speed
-        self.health = 100
-        self.maxHealth = 100
-        self.stamina = 50
-        self.maxStamina = 50
-        self.collided = False
\ No newline at end of file
+    @collided.setter
+    def collided(self, value):
+        self.store.collided[self.index] = bool(value)
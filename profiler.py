@@ -0,0 +1,160 @@
+import json
+from array import array
+from contextlib import nullcontext
+from time import perf_counter
+
+import pygame
+
+import hud
+
+#overlay colours, one per phase in the order phases are first seen
+COLOURS = [
+    (230, 80, 80),
+    (80, 200, 120),
+    (90, 140, 240),
+    (240, 200, 60),
+    (200, 100, 220),
+    (80, 220, 220),
+    (240, 140, 60),
+    (180, 180, 180),
+]
+
+GRAPH_HEIGHT = 100
+GRAPH_MS = 1000 / 30
+
+
+class Span:
+    __slots__ = ("profiler", "index", "start")
+
+    def __init__(self, profiler, index):
+        self.profiler = profiler
+        self.index = index
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.index, self.start, perf_counter())
+
+
+class FrameProfiler:
+    """Times each loop phase into ring buffers of the last capacity frames
+
+    Disabled it hands out one shared no-op context, so leaving the phase()
+    calls in the loop costs a method call per phase. Phases must not nest."""
+
+    def __init__(self, capacity=240, enabled=False, spansPerFrame=32):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.overlay = False
+        self.origin = perf_counter()
+        self.disabledContext = nullcontext()
+
+        self.names = []
+        self.spans = {}
+        self.history = []
+        self.current = array("d")
+        self.frames = 0
+
+        #every timed span for the trace export, oldest are overwritten first
+        self.spanCapacity = capacity * spansPerFrame
+        self.spanPhase = array("H", [0]) * self.spanCapacity
+        self.spanStart = array("d", [0.0]) * self.spanCapacity
+        self.spanEnd = array("d", [0.0]) * self.spanCapacity
+        self.spanCount = 0
+
+        self.surface = None
+        self.font = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return self.disabledContext
+        span = self.spans.get(name)
+        if span is None:
+            span = Span(self, len(self.names))
+            self.spans[name] = span
+            self.names.append(name)
+            self.history.append(array("d", [0.0]) * self.capacity)
+            self.current.append(0.0)
+        return span
+
+    def record(self, index, start, end):
+        self.current[index] += end - start
+        slot = self.spanCount % self.spanCapacity
+        self.spanPhase[slot] = index
+        self.spanStart[slot] = start
+        self.spanEnd[slot] = end
+        self.spanCount += 1
+
+    def endFrame(self):
+        if not self.enabled:
+            return
+        slot = self.frames % self.capacity
+        for i, total in enumerate(self.current):
+            self.history[i][slot] = total
+            self.current[i] = 0.0
+        self.frames += 1
+
+    def toggle(self):
+        #one key turns both timing and the overlay on and off
+        self.enabled = not self.enabled
+        self.overlay = self.enabled
+        #endFrame doesn't run while disabled, so drop a half timed frame
+        for i in range(len(self.current)):
+            self.current[i] = 0.0
+
+    def recentFrames(self):
+        #ring slots from oldest to newest
+        count = min(self.frames, self.capacity)
+        first = self.frames - count
+        return [(first + i) % self.capacity for i in range(count)]
+
+    def drawOverlay(self):
+        """Redraw the frame time graph, one column per frame stacked by phase"""
+        if self.surface is None:
+            self.surface = pygame.Surface((self.capacity, GRAPH_HEIGHT + 14 * len(COLOURS)))
+            self.font = pygame.font.Font(None, 16)
+        surface = self.surface
+        surface.fill((20, 20, 20))
+
+        scale = GRAPH_HEIGHT / GRAPH_MS
+        for x, slot in enumerate(self.recentFrames()):
+            y = GRAPH_HEIGHT
+            for i, history in enumerate(self.history):
+                height = history[slot] * 1000 * scale
+                colour = COLOURS[i % len(COLOURS)]
+                pygame.draw.line(surface, colour, (x, y), (x, max(0, y - height)))
+                y -= height
+
+        #60 fps budget line
+        budget = GRAPH_HEIGHT - (1000 / 60) * scale
+        pygame.draw.line(surface, (255, 255, 255), (0, budget), (self.capacity, budget))
+
+        for i, name in enumerate(self.names):
+            label = hud.glyphs.render(self.font, name, COLOURS[i % len(COLOURS)])
+            surface.blit(label, (4, GRAPH_HEIGHT + 2 + i * 14))
+        return surface
+
+    def traceEvents(self):
+        count = min(self.spanCount, self.spanCapacity)
+        first = self.spanCount - count
+        events = []
+        for n in range(count):
+            slot = (first + n) % self.spanCapacity
+            start = self.spanStart[slot]
+            events.append({
+                "name": self.names[self.spanPhase[slot]],
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": (self.spanEnd[slot] - start) * 1e6,
+                "pid": 1,
+                "tid": 1,
+            })
+        return events
+
+    def dumpTrace(self, path):
+        """Write buffered spans as Chrome trace event JSON (chrome://tracing, Perfetto)"""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.traceEvents(), "displayTimeUnit": "ms"}, f)
+        return path
@@ -0,0 +1,92 @@
+import pygame
+
+
+class Renderer:
+    """Redraws only the parts of the screen that changed since the last frame"""
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.items = {}
+        self.drawn = {}
+        self.forced = []
+        self.fullRedraw = True
+
+    def setBackground(self, background):
+        self.background = background
+        self.fullRedraw = True
+
+    def invalidate(self):
+        self.fullRedraw = True
+
+    def markDirty(self, rect):
+        #for surfaces redrawn in place, which look unchanged to the renderer
+        self.forced.append(pygame.Rect(rect))
+
+    #queue drawing for this frame, items are drawn in the order they are queued
+    def blit(self, key, image, pos):
+        self.items[key] = (image, None, image.get_rect(topleft=pos))
+
+    def rect(self, key, colour, rect):
+        self.items[key] = (None, colour, pygame.Rect(rect))
+
+    def drawItem(self, item):
+        image, colour, rect = item
+        if image is not None:
+            self.screen.blit(image, rect)
+        else:
+            pygame.draw.rect(self.screen, colour, rect)
+
+    def dirtyRects(self):
+        dirty = self.forced
+        for key, item in self.items.items():
+            old = self.drawn.get(key)
+            if old != item:
+                if old is not None:
+                    dirty.append(old[2])
+                dirty.append(item[2])
+        for key, old in self.drawn.items():
+            if key not in self.items:
+                dirty.append(old[2])
+
+        #merge overlapping rects so shared pixels are only restored once
+        merged = []
+        for rect in dirty:
+            rect = rect.clip(self.screen.get_rect())
+            if not rect.w or not rect.h:
+                continue
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def compose(self):
+        """Draw this frame's changes to the screen surface, returns the dirty rects"""
+        if self.fullRedraw:
+            self.screen.blit(self.background, (0, 0))
+            for item in self.items.values():
+                self.drawItem(item)
+            dirty = [self.screen.get_rect()]
+            self.fullRedraw = False
+        else:
+            dirty = self.dirtyRects()
+            for rect in dirty:
+                self.screen.set_clip(rect)
+                self.screen.blit(self.background, rect, rect)
+                for item in self.items.values():
+                    if item[2].colliderect(rect):
+                        self.drawItem(item)
+            self.screen.set_clip(None)
+
+        self.drawn = self.items
+        self.items = {}
+        self.forced = []
+        return dirty
+
+    def present(self):
+        dirty = self.compose()
+        if dirty:
+            pygame.display.update(dirty)
+        return dirty
@@ -0,0 +1,9 @@
+import os
+import sys
+
+#the dungeon package lives at the repository root, next to the game modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#game module tests run headless, no window or sound device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
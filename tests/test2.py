@@ -2,6 +2,27 @@ import random
 from collections import defaultdict, deque
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection, LineCollection
+from matplotlib.figure import Figure
+
+# Room type to color mapping
+ROOM_COLORS = {
+    'common': 'lightgray',
+    'treasure': 'gold',
+    'monster': 'indianred',
+    'trap': 'darkred',
+    'boss': 'crimson',
+    'entrance': 'forestgreen',
+    'exit': 'royalblue'
+}
+
+# Direction indicator drawn at the middle of each connection
+ARROW_OFFSETS = {"north": (0, 0.2), "south": (0, -0.2), "east": (0.2, 0), "west": (-0.2, 0)}
+
+# visualize_map only draws room labels and direction arrows up to this many
+# rooms, past it they are too small to read and dominate the drawing time
+DETAIL_MAX_ROOMS = 400
 
 class Room:
     def __init__(self, id, name, description=None, x=0, y=0):
@@ -216,105 +237,106 @@ class DungeonMap:
         
         return True
     
-    def visualize_map(self, title="Dungeon Map Visualization", save_path=None):
-        """Create a visual representation of the map using matplotlib"""
+    def visualize_map(self, title="Dungeon Map Visualization", save_path=None, show=True, detail=None, dpi=300):
+        """Create a visual representation of the map using matplotlib
+        
+        Rooms, connections and arrows are each drawn as one collection, so
+        large maps render in seconds. detail switches room labels and arrows
+        on or off, by default they are drawn up to DETAIL_MAX_ROOMS rooms.
+        With show=False the map is drawn on an Agg canvas without pyplot,
+        which needs no display; save_path is written either way and the
+        figure is returned."""
         if not self.rooms:
             print("No rooms to visualize.")
-            return
+            return None
         
-        plt.figure(figsize=(12, 10))
-        
-        # Room type to color mapping
-        room_colors = {
-            'common': 'lightgray',
-            'treasure': 'gold',
-            'monster': 'indianred',
-            'trap': 'darkred',
-            'boss': 'crimson',
-            'entrance': 'forestgreen',
-            'exit': 'royalblue'
-        }
+        if detail is None:
+            detail = len(self.rooms) <= DETAIL_MAX_ROOMS
+        
+        if show:
+            fig = plt.figure(figsize=(12, 10))
+        else:
+            fig = Figure(figsize=(12, 10))
+            FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        
+        rooms = list(self.rooms.values())
         
         # Extract coordinates for all rooms
-        x_coords = [room.x for room in self.rooms.values()]
-        y_coords = [room.y for room in self.rooms.values()]
+        x_coords = np.array([room.x for room in rooms], dtype=float)
+        y_coords = np.array([room.y for room in rooms], dtype=float)
         
-        # Draw connections between rooms
-        for room_id, room in self.rooms.items():
+        # Connection lines and the arrows at their midpoints
+        segments = []
+        arrow_offsets = []
+        for room in rooms:
             for direction, connected_id in room.connections.items():
                 connected_room = self.rooms[connected_id]
-                
-                # Draw connection line
-                plt.plot([room.x, connected_room.x], [room.y, connected_room.y], 'k-', alpha=0.6)
-                
-                # Add direction indicator (small arrow) at midpoint
-                mid_x = (room.x + connected_room.x) / 2
-                mid_y = (room.y + connected_room.y) / 2
-                
-                # Arrow direction
-                dx, dy = 0, 0
-                if direction == "north":
-                    dx, dy = 0, 0.2
-                elif direction == "south":
-                    dx, dy = 0, -0.2
-                elif direction == "east":
-                    dx, dy = 0.2, 0
-                elif direction == "west":
-                    dx, dy = -0.2, 0
-                
-                # Add small arrow
-                plt.arrow(mid_x - dx/2, mid_y - dy/2, dx, dy, head_width=0.1, 
-                          head_length=0.1, fc='blue', ec='blue', alpha=0.7)
+                segments.append(((room.x, room.y), (connected_room.x, connected_room.y)))
+                arrow_offsets.append(ARROW_OFFSETS[direction])
         
-        # Plot rooms as circles with different colors based on type
-        for room_id, room in self.rooms.items():
-            color = room_colors.get(room.room_type, 'lightgray')
-            circle = plt.Circle((room.x, room.y), 0.3, color=color, alpha=0.7)
-            plt.gca().add_patch(circle)
+        if segments:
+            segments = np.array(segments, dtype=float)
+            ax.add_collection(LineCollection(segments, colors='k', linewidths=1.5, alpha=0.6))
             
-            # Add room ID and name
-            plt.text(room.x, room.y, str(room.id), 
-                     horizontalalignment='center', verticalalignment='center',
-                     fontweight='bold')
-            
-            # Add room name slightly below
-            plt.text(room.x, room.y - 0.4, room.name, 
-                     horizontalalignment='center', verticalalignment='center',
-                     fontsize=8)
+            if detail:
+                # Small arrows, the 0.1 long head comes on top of the offset
+                mid = segments.mean(axis=1)
+                d = np.array(arrow_offsets, dtype=float)
+                ax.quiver(mid[:, 0] - d[:, 0] / 2, mid[:, 1] - d[:, 1] / 2, d[:, 0] * 1.5, d[:, 1] * 1.5,
+                          angles='xy', scale_units='xy', scale=1, color='blue', alpha=0.7,
+                          units='xy', width=0.005, headwidth=20, headlength=20, headaxislength=20)
+        
+        # Rooms as circles of radius 0.3 with different colors based on type
+        colors = [ROOM_COLORS.get(room.room_type, 'lightgray') for room in rooms]
+        ax.add_collection(EllipseCollection(0.6, 0.6, 0, units='xy', offsets=np.column_stack((x_coords, y_coords)),
+                                            offset_transform=ax.transData, facecolors=colors, alpha=0.7))
+        
+        if detail:
+            for room in rooms:
+                # Add room ID and name
+                ax.text(room.x, room.y, str(room.id), 
+                        horizontalalignment='center', verticalalignment='center',
+                        fontweight='bold')
+                
+                # Add room name slightly below
+                ax.text(room.x, room.y - 0.4, room.name, 
+                        horizontalalignment='center', verticalalignment='center',
+                        fontsize=8)
         
         # Create a legend for room types
         legend_elements = [plt.Line2D([0], [0], marker='o', color='w', 
                            markerfacecolor=color, markersize=10, label=room_type.capitalize())
-                           for room_type, color in room_colors.items()]
+                           for room_type, color in ROOM_COLORS.items()]
         
-        plt.legend(handles=legend_elements, loc='upper right')
+        ax.legend(handles=legend_elements, loc='upper right')
         
         # Set up the plot
-        plt.title(title)
-        plt.grid(True, linestyle='--', alpha=0.7)
+        ax.set_title(title)
+        ax.grid(True, linestyle='--', alpha=0.7)
         
         # Set axis limits with some padding
-        x_min, x_max = min(x_coords) - 1, max(x_coords) + 1
-        y_min, y_max = min(y_coords) - 1, max(y_coords) + 1
-        
-        plt.xlim(x_min, x_max)
-        plt.ylim(y_min, y_max)
+        ax.set_xlim(x_coords.min() - 1, x_coords.max() + 1)
+        ax.set_ylim(y_coords.min() - 1, y_coords.max() + 1)
         
         # Set equal aspect ratio
-        plt.gca().set_aspect('equal')
+        ax.set_aspect('equal')
         
         # Remove axis ticks for cleaner look
-        plt.xticks([])
-        plt.yticks([])
+        ax.set_xticks([])
+        ax.set_yticks([])
+        
+        fig.tight_layout()
         
         # Save the figure if a path is provided
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"Map visualization saved to {save_path}")
         
         # Display the plot
-        plt.tight_layout()
-        plt.show()
+        if show:
+            plt.show()
+        return fig
     
     def generate_map_as_grid(self, grid_size=None):
         """Generate room coordinates in a grid pattern"""
@@ -0,0 +1,51 @@
+import pytest
+
+import animations
+
+
+@pytest.fixture
+def registry():
+    registry = animations.AnimationRegistry()
+    registry.add("walk", "up", ["w0", "w1", "w2", "w3"], 100)
+    registry.add("idle", "up", ["i0", "i1"], (50, 150))
+    return registry
+
+
+def test_cursor_wraps_around(registry):
+    cursor = registry.cursor("walk", "up")
+    images = []
+    for _ in range(10):
+        images.append(cursor.image())
+        cursor.advance(100)
+    assert images == ["w0", "w1", "w2", "w3"] * 2 + ["w0", "w1"]
+
+
+def test_cursor_skips_several_frames(registry):
+    cursor = registry.cursor("idle", "up")
+    cursor.advance(49)
+    assert cursor.image() == "i0"
+    #50 + 150 + 50 ms goes once round and into the second frame
+    cursor.advance(201)
+    assert cursor.image() == "i1"
+    assert cursor.elapsed == 0
+
+
+def test_switching_clips_stays_in_range(registry):
+    cursor = registry.cursor("walk", "up")
+    cursor.advance(300)
+    assert cursor.frame == 3
+    cursor.play(registry.get("idle", "up"))
+    assert cursor.image() == "i1"
+    cursor.play(registry.get("idle", "up"))
+    assert cursor.frame == 1
+
+
+def test_clips_are_shared(registry):
+    assert registry.cursor("walk", "up").clip is registry.cursor("walk", "up").clip
+
+
+def test_bad_durations(registry):
+    with pytest.raises(ValueError, match="2 frames but 3 durations"):
+        registry.add("run", "up", ["r0", "r1"], (1, 2, 3))
+    with pytest.raises(ValueError, match="positive"):
+        registry.add("run", "up", ["r0", "r1"], 0)
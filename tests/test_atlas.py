@@ -0,0 +1,56 @@
+import os
+
+import pygame
+import pytest
+
+import atlas
+
+
+@pytest.fixture
+def cacheDir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def test_build_packs_every_frame():
+    surface, index = atlas.build()
+    for name, info in index["sheets"].items():
+        for flip in (False, True):
+            for row in range(info["rows"]):
+                for frame in range(info["frames"]):
+                    x, y, w, h = index["frames"][atlas.frameKey(name, frame, row, flip)]
+                    assert (w, h) == (64, 64)
+                    assert surface.get_rect().contains(pygame.Rect(x, y, w, h))
+
+
+def test_warm_start_skips_the_build(cacheDir, monkeypatch):
+    cold = atlas.load(cacheDir=cacheDir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("warm start rebuilt the atlas")
+
+    monkeypatch.setattr(atlas, "build", fail)
+    warm = atlas.load(cacheDir=cacheDir)
+    assert warm.index == cold.index
+    for key in list(cold.index["frames"])[:20]:
+        sheet, row, frame, flip = key.split(":")
+        a = cold.get(sheet, int(frame), int(row), flip == "1")
+        b = warm.get(sheet, int(frame), int(row), flip == "1")
+        assert pygame.image.tobytes(a, "RGBA") == pygame.image.tobytes(b, "RGBA")
+
+
+def test_corrupt_cache_is_rebuilt(cacheDir):
+    atlas.load(cacheDir=cacheDir)
+    for name in os.listdir(cacheDir):
+        with open(os.path.join(cacheDir, name), "wb") as f:
+            f.write(b"broken")
+    frames = atlas.load(cacheDir=cacheDir)
+    assert frames.get("idle", 0).get_size() == (64, 64)
+
+
+def test_flipped_frames_mirror():
+    frames = atlas.Atlas(*atlas.build())
+    image = frames.get("walk", 1)
+    mirrored = pygame.transform.flip(frames.get("walk", 1, flip=True), True, False)
+    assert pygame.image.tobytes(image, "RGBA") == pygame.image.tobytes(mirrored, "RGBA")
+    assert frames.get("walk", 1) is image
+    assert len(frames.strip("walk")) == frames.index["sheets"]["walk"]["frames"]
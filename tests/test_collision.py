@@ -0,0 +1,91 @@
+import random
+from array import array
+
+import pygame
+
+import collision
+import entities
+
+
+def randomRects(rng, count, extent=1200):
+    return [pygame.Rect(rng.randrange(-100, extent), rng.randrange(-100, extent),
+                        rng.randrange(1, 300), rng.randrange(1, 300)) for _ in range(count)]
+
+
+def test_query_finds_every_overlap():
+    rng = random.Random(1)
+    walls = randomRects(rng, 60)
+    world = collision.SpatialHash(cellSize=100)
+    for wall in walls:
+        world.insert(wall)
+    assert len(world) == 60
+
+    for box in randomRects(rng, 200):
+        candidates = world.query(box)
+        assert len(candidates) == len(set(map(id, candidates)))
+        for wall in walls:
+            if wall.colliderect(box):
+                assert wall in candidates
+        assert sorted(map(tuple, world.collideAll(box))) == \
+            sorted(tuple(wall) for wall in walls if wall.colliderect(box))
+
+
+def test_sweep_covers_the_whole_move():
+    world = collision.SpatialHash(cellSize=64)
+    wall = pygame.Rect(400, 0, 10, 10)
+    world.insert(wall)
+    box = pygame.Rect(0, 0, 10, 10)
+    assert world.query(box) == []
+    assert world.sweep(box, 500, 0) == [wall]
+    assert world.sweep(box, -500, 0) == []
+
+
+def referenceSlide(store, mult, walls, offset=1, size=62):
+    #the per entity loop slideAll replaced, testing every wall
+    for i in range(len(store)):
+        box = pygame.Rect(store.x[i] + offset, store.y[i] + offset, size, size)
+        moveX = store.vx[i] * store.speed[i] * mult[i]
+        moveY = store.vy[i] * store.speed[i] * mult[i]
+        if pygame.Rect(box.x, box.y + moveY, size, size).collidelist(walls) != -1:
+            store.vy[i] = 0
+        if pygame.Rect(box.x + moveX, box.y, size, size).collidelist(walls) != -1:
+            store.vx[i] = 0
+
+
+def crowd(seed, count=300):
+    rng = random.Random(seed)
+    store = entities.EntityStore()
+    for _ in range(count):
+        i = store.add(rng.uniform(0, 1100), rng.uniform(0, 700), speed=rng.choice([2, 5, 7.5]))
+        store.vx[i] = rng.choice([-1, 0, 1])
+        store.vy[i] = rng.choice([-1, 0, 1])
+    mult = array("d", (rng.choice([1.0, 1.5]) for _ in range(count)))
+    return store, mult
+
+
+def test_slide_all_matches_brute_force():
+    walls = [pygame.Rect(0, 0, 1200, 65), pygame.Rect(0, 760, 1200, 40),
+             pygame.Rect(0, 0, 50, 800), pygame.Rect(1150, 0, 50, 800),
+             pygame.Rect(900, 500, 100, 25), pygame.Rect(300, 300, 40, 40)]
+    world = collision.SpatialHash()
+    for wall in walls:
+        world.insert(wall)
+
+    for seed in range(5):
+        store, mult = crowd(seed)
+        expected, _ = crowd(seed)
+        collision.slideAll(store, mult, world)
+        referenceSlide(expected, mult, walls)
+        assert store.vx == expected.vx
+        assert store.vy == expected.vy
+
+
+def test_slide_along_a_wall():
+    world = collision.SpatialHash()
+    world.insert(pygame.Rect(0, 0, 1200, 65))
+    store = entities.EntityStore()
+    store.add(100, 66, speed=5)
+    store.vx[0] = 1
+    store.vy[0] = -1
+    collision.slideAll(store, array("d", [1.0]), world)
+    assert (store.vx[0], store.vy[0]) == (1, 0)
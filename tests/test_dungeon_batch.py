@@ -0,0 +1,38 @@
+import multiprocessing
+
+import pytest
+
+from dungeon.maps import CompactDungeonMap, build_dungeon, generate_dungeons
+
+SEEDS = [0, 1, 2, 3, 17, "named seed"]
+
+
+@pytest.fixture(scope="module")
+def in_process():
+    return generate_dungeons(SEEDS, num_rooms=60, max_workers=0)
+
+
+@pytest.mark.parametrize("method", ["spawn", None])
+def test_pool_matches_in_process(in_process, method):
+    # spawn imports build_dungeon afresh in every worker, as on Windows and macOS
+    context = multiprocessing.get_context(method) if method else None
+    pooled = generate_dungeons(SEEDS, num_rooms=60, max_workers=2, mp_context=context)
+    assert pooled == in_process
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_seeds_from_a_generator(in_process, max_workers):
+    results = generate_dungeons((seed for seed in SEEDS), num_rooms=60, max_workers=max_workers)
+    assert results == in_process
+
+
+def test_batch_results_load_back(in_process):
+    for result in in_process:
+        dungeon = CompactDungeonMap.load(result.data)
+        built = build_dungeon(result.seed, num_rooms=60)
+        assert len(dungeon.rooms) == 60
+        assert dungeon.validate_map()
+        for room_id, room in built.rooms.items():
+            assert dict(dungeon.rooms[room_id].connections) == dict(room.connections)
+            assert (dungeon.rooms[room_id].x, dungeon.rooms[room_id].y) == (room.x, room.y)
+        assert result.scores["reachability"] == 1.0
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from dungeon import maps
+
+
+def positions(dungeon):
+    return [(room.x, room.y, dict(room.connections)) for room in dungeon.rooms.values()]
+
+
+@pytest.fixture
+def expected():
+    return positions(maps.build_dungeon(7, 30))
+
+
+def cache_files(cache_dir):
+    return sorted(os.listdir(cache_dir))
+
+
+def test_miss_builds_and_saves(tmp_path, expected):
+    dungeon = maps.load_dungeon(7, 30, cache_dir=str(tmp_path))
+    assert dungeon.read_only
+    assert positions(dungeon) == expected
+    files = cache_files(tmp_path)
+    assert len(files) == 1 and files[0].endswith(".dgn")
+
+
+def test_hit_does_not_rebuild(tmp_path, expected, monkeypatch):
+    maps.load_dungeon(7, 30, cache_dir=str(tmp_path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit rebuilt the map")
+
+    monkeypatch.setattr(maps, "build_dungeon", fail)
+    dungeon = maps.load_dungeon(7, 30, cache_dir=str(tmp_path))
+    assert dungeon.read_only
+    assert positions(dungeon) == expected
+
+
+@pytest.mark.parametrize("contents", [b"", b"DGNM", b"garbage" * 10, None])
+def test_corrupt_entry_is_replaced(tmp_path, expected, contents):
+    maps.load_dungeon(7, 30, cache_dir=str(tmp_path))
+    path = tmp_path / cache_files(tmp_path)[0]
+    data = path.read_bytes()
+    path.write_bytes(data[:40] if contents is None else contents)
+
+    dungeon = maps.load_dungeon(7, 30, cache_dir=str(tmp_path))
+    assert positions(dungeon) == expected
+    assert path.read_bytes() == data
+    assert cache_files(tmp_path) == [path.name]
+
+
+def test_unwritable_cache_dir(tmp_path, expected):
+    # a directory that can't be created, even for root
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    dungeon = maps.load_dungeon(7, 30, cache_dir=str(blocker / "cache"))
+    assert dungeon.read_only
+    assert positions(dungeon) == expected
+    with pytest.raises(TypeError, match="read-only"):
+        dungeon.add_room("Room")
+    assert cache_files(tmp_path) == ["blocker"]
+
+
+def test_failed_save_leaves_no_temp_file(tmp_path, expected, monkeypatch):
+    def replace(src, dst):
+        raise PermissionError(dst)
+
+    monkeypatch.setattr(maps.os, "replace", replace)
+    dungeon = maps.load_dungeon(7, 30, cache_dir=str(tmp_path))
+    assert dungeon.read_only
+    assert positions(dungeon) == expected
+    assert cache_files(tmp_path) == []
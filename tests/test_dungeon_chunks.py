@@ -0,0 +1,117 @@
+import pytest
+
+from dungeon.maps import OPPOSITE_DIRECTIONS, ChunkedDungeon
+
+STEPS = {"north": (0, 1), "south": (0, -1), "east": (1, 0), "west": (-1, 0)}
+
+
+def snapshot(chunk):
+    return {room_id: (room.name, room.description, room.room_type, room.x, room.y,
+                      dict(room.connections))
+            for room_id, room in chunk.rooms.items()}
+
+
+def test_room_ids_follow_zigzag_cantor_order():
+    # with one room per chunk the id is the Cantor pair of the zigzagged
+    # coordinates plus one: 0, -1, 1, -2 ... zigzag to 0, 1, 2, 3 ...
+    dungeon = ChunkedDungeon(chunk_size=1)
+    order = [(0, 0), (-1, 0), (0, -1), (1, 0), (-1, -1), (0, 1)]
+    assert [dungeon.room_id(x, y) for x, y in order] == [1, 2, 3, 4, 5, 6]
+    assert [dungeon.room_position(room_id) for room_id in range(1, 7)] == order
+
+
+def test_room_ids_within_a_chunk():
+    dungeon = ChunkedDungeon(chunk_size=4)
+    assert [dungeon.room_id(x, 0) for x in range(4)] == [1, 2, 3, 4]
+    assert dungeon.room_id(0, 1) == 5
+    assert dungeon.room_id(-4, 0) == 16 + 1
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 7])
+def test_room_ids_are_unique_and_invert(chunk_size):
+    dungeon = ChunkedDungeon(chunk_size=chunk_size)
+    ids = set()
+    for x in range(-15, 15):
+        for y in range(-15, 15):
+            room_id = dungeon.room_id(x, y)
+            assert room_id >= 1
+            assert dungeon.room_position(room_id) == (x, y)
+            ids.add(room_id)
+    assert len(ids) == 30 * 30
+
+
+def test_rooms_carry_their_world_ids():
+    dungeon = ChunkedDungeon(seed=3, chunk_size=4)
+    for room_id, room in dungeon.get_chunk(-2, 1).rooms.items():
+        assert dungeon.room_id(room.x, room.y) == room_id
+        assert dungeon.room(room_id) is room
+
+
+@pytest.mark.parametrize("order", [((0, 0), (1, 0)), ((1, 0), (0, 0))])
+def test_doorways_are_reciprocal_across_chunks(order):
+    dungeon = ChunkedDungeon(seed="stitch", chunk_size=5)
+    for cx, cy in order:
+        dungeon.get_chunk(cx, cy)
+    for cx, cy in [(0, 0), (1, 0), (0, 1), (-1, -1)]:
+        dungeon.load_around(cx * 5, cy * 5)
+    for (cx, cy), chunk in list(dungeon.chunks.items()):
+        for room in chunk.rooms.values():
+            for direction, connected_id in room.connections.items():
+                dx, dy = STEPS[direction]
+                assert dungeon.room_position(connected_id) == (room.x + dx, room.y + dy)
+                other = dungeon.room(connected_id)
+                if (other.x // 5, other.y // 5) != (cx, cy):
+                    assert other.connections.get(OPPOSITE_DIRECTIONS[direction]) == room.id
+
+
+def test_each_chunk_edge_has_one_doorway():
+    dungeon = ChunkedDungeon(seed=11, chunk_size=6)
+    chunk = dungeon.get_chunk(2, -3)
+    crossings = {}
+    for room in chunk.rooms.values():
+        for direction, connected_id in room.connections.items():
+            x, y = dungeon.room_position(connected_id)
+            if (x // 6, y // 6) != (2, -3):
+                crossings[direction] = crossings.get(direction, 0) + 1
+    assert crossings == {"north": 1, "south": 1, "east": 1, "west": 1}
+    assert dungeon.doorway(2, -3, "east") == dungeon.doorway(3, -3, "west")
+    assert dungeon.doorway(2, -3, "north") == dungeon.doorway(2, -2, "south")
+
+
+def test_chunks_regenerate_identically_after_eviction():
+    dungeon = ChunkedDungeon(seed=42, chunk_size=4, max_chunks=2)
+    first = snapshot(dungeon.get_chunk(0, 0))
+    dungeon.get_chunk(1, 0)
+    dungeon.get_chunk(0, 1)
+    assert (0, 0) not in dungeon.chunks
+    assert len(dungeon.chunks) == 2
+    assert snapshot(dungeon.get_chunk(0, 0)) == first
+    assert snapshot(ChunkedDungeon(seed=42, chunk_size=4).get_chunk(0, 0)) == first
+    assert snapshot(ChunkedDungeon(seed=43, chunk_size=4).get_chunk(0, 0)) != first
+
+
+def test_lru_keeps_recently_used_chunks():
+    dungeon = ChunkedDungeon(chunk_size=2, max_chunks=2)
+    dungeon.get_chunk(0, 0)
+    dungeon.get_chunk(1, 0)
+    dungeon.get_chunk(0, 0)
+    dungeon.get_chunk(2, 0)
+    assert list(dungeon.chunks) == [(0, 0), (2, 0)]
+
+
+def test_window_is_a_valid_map():
+    dungeon = ChunkedDungeon(seed=5, chunk_size=4)
+    window = dungeon.window(-1, -1, 1, 0)
+    assert len(window.rooms) == 3 * 2 * 16
+    assert window.validate_map()
+    for room in window.rooms.values():
+        assert all(connected_id in window.rooms for connected_id in room.connections.values())
+
+
+def test_window_bounds():
+    dungeon = ChunkedDungeon(chunk_size=2)
+    assert len(dungeon.window(3, 3, 3, 3).rooms) == 4
+    with pytest.raises(ValueError, match="empty window"):
+        dungeon.window(1, 0, 0, 0)
+    with pytest.raises(ValueError, match="empty window"):
+        dungeon.window(0, 2, 0, 1)
@@ -0,0 +1,102 @@
+import contextlib
+import gzip
+import io
+import json
+
+import pytest
+
+from dungeon import export
+from dungeon.maps import build_dungeon
+
+
+def legacy_print_map(rooms):
+    """The print loop print_map used to run"""
+    print("\nMap Connections:")
+    for room_id, room in rooms.items():
+        print(f"Room {room_id} ({room.name}):")
+        for direction, connected_id in room.connections.items():
+            connected_room = rooms[connected_id]
+            print(f"  {direction.capitalize()} -> Room {connected_id} ({connected_room.name})")
+        print()
+
+
+@pytest.fixture(params=[True, False], ids=["compact", "dict"])
+def dungeon(request):
+    return build_dungeon(9, num_rooms=50, compact=request.param)
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setattr(export, "BATCH_ROOMS", 7)
+
+
+def test_text_matches_print_map(dungeon, small_batches):
+    expected = io.StringIO()
+    with contextlib.redirect_stdout(expected):
+        legacy_print_map(dungeon.rooms)
+    out = io.StringIO()
+    dungeon.print_map(out)
+    assert out.getvalue() == expected.getvalue()
+
+
+def test_print_map_defaults_to_stdout(dungeon, capsys):
+    dungeon.print_map()
+    assert capsys.readouterr().out.startswith("\nMap Connections:\nRoom 1 (")
+
+
+def test_batches_cover_every_room(dungeon, small_batches):
+    chunks = list(export.jsonl_lines(dungeon.rooms))
+    assert len(chunks) == 8  # 50 rooms in batches of 7
+    ids = [json.loads(line)["id"] for chunk in chunks for line in chunk.splitlines()]
+    assert ids == list(dungeon.rooms)
+
+
+def test_jsonl_parses_back(dungeon, tmp_path):
+    path = dungeon.export(str(tmp_path / "map.jsonl"), format="jsonl")
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["id"] for record in records] == list(dungeon.rooms)
+    for record in records:
+        room = dungeon.rooms[record["id"]]
+        assert (record["name"], record["description"], record["type"]) == \
+            (room.name, room.description, room.room_type)
+        assert (record["x"], record["y"]) == (room.x, room.y)
+        assert record["connections"] == dict(room.connections)
+
+
+def test_jsonl_keeps_unicode():
+    rooms = build_dungeon(1, num_rooms=1, compact=False).rooms
+    rooms[1].name = "Salle d'été ☃"
+    line = "".join(export.jsonl_lines(rooms))
+    assert "☃" in line
+    assert json.loads(line)["name"] == "Salle d'été ☃"
+
+
+def test_dot_has_one_edge_per_corridor(dungeon):
+    text = "".join(export.dot_lines(dungeon.rooms))
+    assert text.startswith("graph dungeon {\n") and text.endswith("}\n")
+    corridors = sum(len(room.connections) for room in dungeon.rooms.values()) // 2
+    assert text.count(" -- ") == corridors
+    assert "arrowhead=normal" not in text
+    assert text.count("pos=") == len(dungeon.rooms)
+
+
+def test_dot_marks_one_way_connections():
+    dungeon = build_dungeon(1, num_rooms=4, compact=False)
+    room = dungeon.rooms[1]
+    direction, connected_id = next(iter(room.connections.items()))
+    del dungeon.rooms[connected_id].connections[export.OPPOSITE_DIRECTIONS[direction]]
+    text = "".join(export.dot_lines(dungeon.rooms))
+    assert f"  1 -- {connected_id} [label={direction}, dir=forward, arrowhead=normal];\n" in text
+
+
+@pytest.mark.parametrize("format", sorted(export.FORMATS))
+def test_gzip_round_trip(dungeon, tmp_path, format):
+    plain = dungeon.export(str(tmp_path / f"map.{format}"), format=format)
+    packed = dungeon.export(str(tmp_path / f"map.{format}.gz"), format=format)
+    forced = dungeon.export(str(tmp_path / f"map-{format}"), format=format, compress=True)
+    with open(plain, "rb") as f:
+        expected = f.read()
+    for path in (packed, forced):
+        with gzip.open(path, "rb") as f:
+            assert f.read() == expected
@@ -0,0 +1,94 @@
+import struct
+
+import pytest
+
+from dungeon.compact import CompactRooms
+from dungeon.format import FORMAT_VERSION, HEADER, MAGIC, MappedRooms, dumps, save
+from dungeon.maps import CompactDungeonMap
+
+
+def sample_store():
+    store = CompactRooms()
+    store.add("Entrance", None, 0, 0, "entrance")
+    store.add("Salle d'été ☃", "Où la neige ne fond jamais", -3, 7, "common")
+    store.add("Shrine", "A quiet shrine", 2, -1, "shrine")
+    store.add("Entrance", None, 2**31 - 1, -2**31, "entrance")
+    store.set_neighbour(1, 1, 2)
+    store.set_neighbour(2, 3, 1)
+    store.set_neighbour(3, 0, 4)
+    return store
+
+
+def rooms_of(store):
+    return [(store.name(i), store.description(i), store.xs[i - 1], store.ys[i - 1],
+             store.room_type(i), [store.neighbour(i, d) for d in range(4)])
+            for i in range(1, len(store) + 1)]
+
+
+def test_round_trip_bytes():
+    store = sample_store()
+    mapped = MappedRooms(dumps(store))
+    assert len(mapped) == len(store)
+    assert rooms_of(mapped) == rooms_of(store)
+    assert mapped.description(1) == "Room 1"
+    assert "shrine" in mapped.type_names
+
+
+def test_round_trip_file(tmp_path):
+    store = sample_store()
+    path = save(store, tmp_path / "map.dgn")
+    with MappedRooms(str(path)) as mapped:
+        assert rooms_of(mapped) == rooms_of(store)
+
+
+def test_empty_map_round_trips():
+    assert len(MappedRooms(dumps(CompactRooms()))) == 0
+
+
+def test_bad_magic():
+    data = b"NOPE" + dumps(sample_store())[4:]
+    with pytest.raises(ValueError, match="not a dungeon map"):
+        MappedRooms(data)
+
+
+def test_bad_version():
+    data = bytearray(dumps(sample_store()))
+    struct.pack_into("<H", data, len(MAGIC), FORMAT_VERSION + 1)
+    with pytest.raises(ValueError, match="format version"):
+        MappedRooms(bytes(data))
+
+
+@pytest.mark.parametrize("size", [0, 3, HEADER.size - 1, HEADER.size, 40, -1])
+def test_truncated(size):
+    data = dumps(sample_store())
+    with pytest.raises(ValueError, match="short|truncated"):
+        MappedRooms(data[:size])
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / "map.dgn"
+    path.write_bytes(dumps(sample_store())[:40])
+    with pytest.raises(ValueError, match="truncated"):
+        MappedRooms(str(path))
+
+
+def test_mapped_rooms_are_read_only():
+    mapped = MappedRooms(dumps(sample_store()))
+    with pytest.raises(TypeError, match="read-only"):
+        mapped.add("Room", None, 0, 0, "common")
+    with pytest.raises(TypeError, match="read-only"):
+        mapped.set_neighbour(1, 0, 2)
+    with pytest.raises(TypeError, match="read-only"):
+        mapped.intern_type("vault")
+
+
+def test_loaded_map_is_read_only():
+    dungeon = CompactDungeonMap.load(dumps(sample_store()))
+    with pytest.raises(TypeError, match="read-only"):
+        dungeon.add_room("Room")
+    with pytest.raises(TypeError, match="read-only"):
+        dungeon.connect_rooms(3, 2, "east")
+    with pytest.raises(TypeError, match="read-only"):
+        dungeon.move_room(1, 5, 5)
+    with pytest.raises(TypeError, match="read-only"):
+        dungeon.generate_map_as_grid()
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from dungeon import graph
+from dungeon.graph import DisjointSet, kruskal, manhattan_mst
+
+
+def distance(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def prim_length(points):
+    """Length of a Manhattan MST by the O(n^2) Prim loop"""
+    best = [distance(points[0], p) for p in points]
+    done = [False] * len(points)
+    done[0] = True
+    total = 0
+    for _ in range(len(points) - 1):
+        i = min((i for i in range(len(points)) if not done[i]), key=best.__getitem__)
+        done[i] = True
+        total += best[i]
+        for j, p in enumerate(points):
+            if not done[j]:
+                best[j] = min(best[j], distance(points[i], p))
+    return total
+
+
+def random_points(n, side, seed):
+    rng = random.Random(seed)
+    return [(rng.randint(-side, side), rng.randint(-side, side)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("n, side", [(2, 5), (10, 3), (50, 100), (200, 10), (300, 1000)])
+@pytest.mark.parametrize("seed", range(3))
+def test_manhattan_mst_matches_prim(n, side, seed):
+    points = random_points(n, side, seed)
+    tree = manhattan_mst(points)
+
+    assert len(tree) == n - 1
+    sets = DisjointSet(n)
+    for i, j in tree:
+        assert sets.union(i, j)
+    assert sets.components == 1
+    assert sum(distance(points[i], points[j]) for i, j in tree) == prim_length(points)
+
+
+def test_manhattan_mst_grid_and_duplicates():
+    points = [(x, y) for x in range(12) for y in range(12)] + [(3, 3), (3, 3)]
+    tree = manhattan_mst(points)
+    assert len(tree) == len(points) - 1
+    assert sum(distance(points[i], points[j]) for i, j in tree) == len(points) - 3
+
+
+@pytest.mark.skipif(graph.np is None, reason="numpy is not installed")
+@pytest.mark.parametrize("seed", range(3))
+def test_manhattan_mst_same_tree_without_numpy(seed, monkeypatch):
+    points = random_points(300, 50, seed)
+    tree = manhattan_mst(points)
+    monkeypatch.setattr(graph, "np", None)
+    assert manhattan_mst(points) == tree
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_manhattan_mst_float_points(seed, monkeypatch):
+    rng = random.Random(seed)
+    points = [(rng.uniform(-10, 10), rng.uniform(-10, 10)) for _ in range(100)]
+    tree = manhattan_mst(points)
+    assert sum(distance(points[i], points[j]) for i, j in tree) == pytest.approx(prim_length(points))
+    monkeypatch.setattr(graph, "np", None)
+    assert manhattan_mst(points) == tree
+
+
+def test_manhattan_mst_ties_are_repeatable():
+    # a grid has many minimum trees, the same input must pick the same one
+    points = [(x, y) for y in range(15) for x in range(15)]
+    random.Random(3).shuffle(points)
+    tree = manhattan_mst(points)
+    assert manhattan_mst(list(points)) == tree
+    assert sum(distance(points[i], points[j]) for i, j in tree) == len(points) - 1
+
+
+def test_manhattan_mst_trivial():
+    assert manhattan_mst([]) == []
+    assert manhattan_mst([(4, 2)]) == []
+
+
+def test_kruskal_forest():
+    edges = [(1, 0, 1), (5, 1, 2), (2, 0, 2), (1, 3, 4)]
+    assert kruskal(5, edges) == [(0, 1), (3, 4), (0, 2)]
+
+
+@pytest.mark.parametrize("typecode", [None, "I"])
+def test_disjoint_set(typecode):
+    sets = DisjointSet(4, typecode)
+    assert sets.union(0, 1)
+    assert not sets.union(1, 0)
+    assert sets.add() == 4
+    assert sets.union(4, 1)
+    assert sets.find(4) == sets.find(0)
+    assert sets.find(2) != sets.find(0)
+    assert sets.components == 3
@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from dungeon.index import CoordinateIndex, GridIndex
+
+DIRECTIONS = ("north", "east", "south", "west")
+
+
+def expected_aligned(rooms, x, y, direction):
+    """Room ids in line with (x, y) in direction, nearest first, by brute force"""
+    if direction == "north":
+        found = [(ry - y, room_id) for room_id, (rx, ry) in rooms.items() if rx == x and ry > y]
+    elif direction == "south":
+        found = [(y - ry, -room_id) for room_id, (rx, ry) in rooms.items() if rx == x and ry < y]
+    elif direction == "east":
+        found = [(rx - x, room_id) for room_id, (rx, ry) in rooms.items() if ry == y and rx > x]
+    else:
+        found = [(x - rx, -room_id) for room_id, (rx, ry) in rooms.items() if ry == y and rx < x]
+    return [abs(room_id) for _, room_id in sorted(found)]
+
+
+def random_rooms(count, side, seed):
+    rng = random.Random(seed)
+    return {room_id: (rng.randint(0, side), rng.randint(0, side)) for room_id in range(1, count + 1)}
+
+
+def check(index, rooms, side):
+    for x in range(-1, side + 2):
+        for y in range(-1, side + 2):
+            for direction in DIRECTIONS:
+                expected = expected_aligned(rooms, x, y, direction)
+                assert list(index.aligned(x, y, direction)) == expected
+                assert index.nearest(x, y, direction) == (expected[0] if expected else None)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_coordinate_index_add(seed):
+    rooms = random_rooms(60, 8, seed)
+    index = CoordinateIndex()
+    for room_id, (x, y) in rooms.items():
+        index.add(room_id, x, y)
+    check(index, rooms, 8)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_coordinate_index_move_and_remove(seed):
+    rng = random.Random(seed)
+    rooms = random_rooms(60, 8, seed)
+    index = CoordinateIndex()
+    for room_id, (x, y) in rooms.items():
+        index.add(room_id, x, y)
+    for room_id in rng.sample(sorted(rooms), 20):
+        x, y = rng.randint(0, 8), rng.randint(0, 8)
+        index.move(room_id, *rooms[room_id], x, y)
+        rooms[room_id] = (x, y)
+    for room_id in rng.sample(sorted(rooms), 10):
+        index.remove(room_id, *rooms.pop(room_id))
+    check(index, rooms, 8)
+    assert all(index.rows.values()) and all(index.columns.values())
+
+
+class Spot:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def test_coordinate_index_rebuild():
+    rooms = random_rooms(80, 6, 7)
+    index = CoordinateIndex()
+    index.rebuild({room_id: Spot(x, y) for room_id, (x, y) in rooms.items()})
+    check(index, rooms, 6)
+
+    from_lists = CoordinateIndex()
+    from_lists.rebuild_from(list(rooms), [x for x, _ in rooms.values()], [y for _, y in rooms.values()])
+    assert from_lists.rows == index.rows
+    assert from_lists.columns == index.columns
+
+
+def test_grid_index_query():
+    rng = random.Random(3)
+    boxes = {}
+    index = GridIndex(cell_size=4)
+    for item in range(200):
+        min_x, min_y = rng.randint(-30, 30), rng.randint(-30, 30)
+        max_x, max_y = min_x + rng.randint(0, 6), min_y + rng.randint(0, 6)
+        boxes[item] = (min_x, min_y, max_x, max_y)
+        index.insert(item, min_x, min_y, max_x, max_y)
+
+    for _ in range(100):
+        min_x, min_y = rng.randint(-35, 35), rng.randint(-35, 35)
+        max_x, max_y = min_x + rng.randint(0, 20), min_y + rng.randint(0, 20)
+        found = set(index.query(min_x, min_y, max_x, max_y))
+        overlapping = {item for item, (a, b, c, d) in boxes.items()
+                       if a <= max_x and c >= min_x and b <= max_y and d >= min_y}
+        # buckets are whole cells, so a query may return near misses but never drops a hit
+        assert overlapping <= found
+        assert len(found) == len(index.query(min_x, min_y, max_x, max_y))
@@ -0,0 +1,39 @@
+import math
+import random
+
+import pytest
+
+from dungeon import maps
+
+
+def grid_positions(seed, num_rooms=40, grid_size=None, cls=maps.DungeonMap):
+    dungeon = cls(random.Random(seed))
+    for i in range(num_rooms):
+        dungeon.add_room(f"Room {i + 1}")
+    dungeon.generate_map_as_grid(grid_size)
+    return [(room.x, room.y) for room in dungeon.rooms.values()]
+
+
+def shuffled_tuples(seed, num_rooms=40, grid_size=None):
+    """The positions the original shuffled list of (x, y) tuples gave"""
+    dungeon = maps.DungeonMap(random.Random(seed))
+    for i in range(num_rooms):
+        dungeon.add_room(f"Room {i + 1}")
+    side = math.ceil(math.sqrt(num_rooms))
+    max_x, max_y = grid_size or (side, side)
+    positions = [(x, y) for y in range(max_y) for x in range(max_x)]
+    dungeon.rng.shuffle(positions)
+    placed = positions[:num_rooms]
+    return placed + [(room.x, room.y) for room in list(dungeon.rooms.values())[len(placed):]]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("num_rooms, grid_size", [(40, None), (1, None), (12, (3, 4)), (30, (4, 5))])
+@pytest.mark.parametrize("cls", [maps.DungeonMap, maps.CompactDungeonMap])
+def test_grid_layout_matches_tuple_shuffle(seed, num_rooms, grid_size, cls):
+    assert grid_positions(seed, num_rooms, grid_size, cls) == shuffled_tuples(seed, num_rooms, grid_size)
+
+
+def test_grid_layout_places_every_room_once():
+    positions = grid_positions(0, num_rooms=49)
+    assert sorted(positions) == [(x, y) for x in range(7) for y in range(7)]
@@ -0,0 +1,111 @@
+import random
+
+from dungeon.maps import OPPOSITE_DIRECTIONS
+from dungeon.paths import PathFinder, astar, bidirectional_bfs, dijkstra, path_cost
+
+
+class Spot:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.connections = {}
+
+
+class Dungeon:
+    def __init__(self, rooms):
+        self.rooms = rooms
+        self.version = 0
+
+
+def grid_maze(side, seed):
+    """side x side rooms joined by a random spanning tree plus a few loops"""
+    rng = random.Random(seed)
+    rooms = {y * side + x + 1: Spot(x, y) for y in range(side) for x in range(side)}
+    walls = []
+    for room_id, room in rooms.items():
+        if room.x + 1 < side:
+            walls.append((room_id, room_id + 1, "east"))
+        if room.y + 1 < side:
+            walls.append((room_id, room_id + side, "north"))
+    rng.shuffle(walls)
+    parent = {room_id: room_id for room_id in rooms}
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for a, b, direction in walls:
+        if find(a) != find(b) or rng.random() < 0.05:
+            parent[find(a)] = find(b)
+            rooms[a].connections[direction] = b
+            rooms[b].connections[OPPOSITE_DIRECTIONS[direction]] = a
+    return rooms
+
+
+def assert_walkable(rooms, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for a, b in zip(path, path[1:]):
+        assert b in rooms[a].connections.values()
+
+
+def test_astar_is_shortest():
+    rooms = grid_maze(12, 1)
+    rng = random.Random(2)
+    for _ in range(30):
+        start, goal = rng.choice(list(rooms)), rng.choice(list(rooms))
+        path = astar(rooms, start, goal)
+        assert_walkable(rooms, path, start, goal)
+        best, _ = dijkstra(rooms, start)
+        assert path_cost(rooms, path) == best[goal]
+        assert_walkable(rooms, bidirectional_bfs(rooms, start, goal), start, goal)
+
+
+def test_hierarchical_paths_are_walkable():
+    rooms = grid_maze(40, 3)
+    finder = PathFinder(Dungeon(rooms), cluster_size=8, hierarchical_from=0)
+    rng = random.Random(4)
+    for _ in range(30):
+        start, goal = rng.choice(list(rooms)), rng.choice(list(rooms))
+        path = finder.path(start, goal)
+        assert_walkable(rooms, path, start, goal)
+        best, _ = dijkstra(rooms, start)
+        assert path_cost(rooms, path) >= best[goal]
+
+
+def test_cached_paths_are_immutable_and_dropped_on_change():
+    rooms = grid_maze(6, 5)
+    dungeon = Dungeon(rooms)
+    finder = PathFinder(dungeon)
+    path = finder.path(1, 36)
+    assert isinstance(path, tuple)
+    assert finder.path(1, 36) is path
+    assert isinstance(finder.hops(1, 36), tuple)
+
+    dungeon.version += 1
+    assert finder.path(1, 36) is not path
+    assert finder.path(1, 36) == path
+
+
+def test_unreachable_pairs_are_cached_and_kept_recent():
+    rooms = grid_maze(4, 6)
+    rooms[99] = Spot(10, 10)  # no corridors
+    finder = PathFinder(Dungeon(rooms), cache_size=2)
+    assert finder.path(1, 99) is None
+    assert finder.path(1, 2) is not None
+    # the hit on the None result makes it the most recent entry
+    assert finder.path(1, 99) is None
+    assert finder.path(2, 3) is not None
+    assert ("path", 1, 99) in finder.cache
+    assert ("path", 1, 2) not in finder.cache
+    assert list(finder.cache) == [("path", 1, 99), ("path", 2, 3)]
+
+
+def test_dijkstra_within():
+    rooms = grid_maze(6, 7)
+    best, came_from = dijkstra(rooms, 1, lambda room_id: rooms[room_id].x < 3)
+    assert all(rooms[room_id].x < 3 for room_id in best if room_id != 1)
+    for room_id in best:
+        step = came_from[room_id]
+        if step is not None:
+            assert room_id in rooms[step].connections.values()
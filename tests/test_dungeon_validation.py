@@ -0,0 +1,108 @@
+import random
+from collections import deque
+
+import pytest
+
+from dungeon.compact import DIRECTION_INDEX, NO_ROOM
+from dungeon.maps import OPPOSITE_DIRECTIONS, CompactDungeonMap, DungeonMap
+
+
+def bfs_valid(rooms):
+    """validate_map the slow way: every connection reciprocal, every room reached"""
+    for room_id, room in rooms.items():
+        for direction, connected_id in room.connections.items():
+            if connected_id not in rooms:
+                return False
+            if rooms[connected_id].connections.get(OPPOSITE_DIRECTIONS[direction]) != room_id:
+                return False
+    start = next(iter(rooms))
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for connected_id in rooms[queue.popleft()].connections.values():
+            if connected_id not in seen:
+                seen.add(connected_id)
+                queue.append(connected_id)
+    return len(seen) == len(rooms)
+
+
+def remove_connection(dungeon, room_id, direction):
+    """Drop one side of a corridor by hand, the way invalidate() is meant for"""
+    if isinstance(dungeon, CompactDungeonMap):
+        dungeon.store.set_neighbour(room_id, DIRECTION_INDEX[direction], NO_ROOM)
+    else:
+        del dungeon.rooms[room_id].connections[direction]
+    dungeon.invalidate()
+
+
+@pytest.mark.parametrize("cls", [DungeonMap, CompactDungeonMap])
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_matches_bfs(cls, seed):
+    rng = random.Random(seed)
+    dungeon = cls(random.Random(seed))
+    dungeon.add_room("Room 1")
+    for step in range(120):
+        action = rng.random()
+        room_ids = list(dungeon.rooms)
+        if action < 0.2 or len(room_ids) < 2:
+            dungeon.add_room(f"Room {len(room_ids) + 1}")
+        elif action < 0.9:
+            room1_id, room2_id = rng.sample(room_ids, 2)
+            direction = rng.choice(list(OPPOSITE_DIRECTIONS))
+            overwrite = (direction in dungeon.rooms[room1_id].connections
+                         or OPPOSITE_DIRECTIONS[direction] in dungeon.rooms[room2_id].connections)
+            dungeon.connect_rooms(room1_id, room2_id, direction)
+            # overwriting a corridor can split a component, only a recount tells
+            assert dungeon.validation_stale or not overwrite
+        else:
+            room_id = rng.choice(room_ids)
+            connections = dungeon.rooms[room_id].connections
+            if connections:
+                remove_connection(dungeon, room_id, rng.choice(sorted(connections)))
+                assert dungeon.validation_stale
+
+        assert dungeon.validate_map() == bfs_valid(dungeon.rooms), step
+        assert not dungeon.validation_stale
+        assert dungeon.validate_map(full=True) == bfs_valid(dungeon.rooms), step
+
+
+@pytest.mark.parametrize("cls", [DungeonMap, CompactDungeonMap])
+def test_stale_flag(cls):
+    dungeon = cls(random.Random(0))
+    for i in range(3):
+        dungeon.add_room(f"Room {i + 1}")
+    dungeon.connect_rooms(1, 2, "east")
+    dungeon.connect_rooms(2, 3, "east")
+    assert not dungeon.validation_stale
+    assert dungeon.validate_map()
+
+    # 1 -> 3 east replaces 1 -> 2 and 3 -> 2, leaving both of 2's exits one-way
+    dungeon.connect_rooms(1, 3, "east")
+    assert dungeon.validation_stale
+    assert not dungeon.validate_map()
+    assert not dungeon.validation_stale
+    assert dungeon.mismatches == 2
+
+    remove_connection(dungeon, 2, "west")
+    remove_connection(dungeon, 2, "east")
+    assert dungeon.validation_stale
+    assert not dungeon.validate_map()  # 2 is cut off
+    assert dungeon.mismatches == 0
+
+    # a fresh corridor on free sides is tracked without a recount
+    dungeon.connect_rooms(1, 2, "north")
+    assert not dungeon.validation_stale
+    assert dungeon.validate_map()
+    assert dungeon.validate_map() == bfs_valid(dungeon.rooms)
+
+
+def test_full_recount_after_hand_edit():
+    dungeon = DungeonMap(random.Random(0))
+    dungeon.add_room("Room 1")
+    dungeon.add_room("Room 2")
+    dungeon.connect_rooms(1, 2, "north")
+    assert dungeon.validate_map()
+    # edited without invalidate(), only full=True notices
+    del dungeon.rooms[2].connections["south"]
+    assert dungeon.validate_map()
+    assert not dungeon.validate_map(full=True)
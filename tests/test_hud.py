@@ -0,0 +1,69 @@
+import pygame
+import pytest
+
+import hud
+import renderer
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 16)
+
+
+def test_update_returns_old_and_new_rects():
+    playerHud = hud.Hud()
+    bar = playerHud.add("health", hud.Bar((100, 50), (255, 0, 0)))
+
+    first = playerHud.update(health=10)
+    assert first[1] == bar.rect
+    assert bar.rect.size == (10 * 5 + 10, 50)
+
+    assert playerHud.update(health=10) == []
+
+    old = bar.rect.copy()
+    assert playerHud.update(health=4) == [old, bar.rect]
+    assert bar.rect.center == (100, 50)
+
+
+def test_hud_rects_reach_the_renderer():
+    screen = pygame.Surface((200, 100))
+    background = pygame.Surface((200, 100))
+    background.fill((50, 50, 50))
+    frameRenderer = renderer.Renderer(screen, background)
+    playerHud = hud.Hud()
+    playerHud.add("health", hud.Bar((100, 50), (255, 0, 0)))
+    playerHud.update(health=10)
+    playerHud.draw(frameRenderer)
+    frameRenderer.compose()
+
+    for rect in playerHud.update(health=2):
+        frameRenderer.markDirty(rect)
+    playerHud.draw(frameRenderer)
+    dirty = frameRenderer.compose()
+    #the shrinking bar's old area is restored from the background
+    assert dirty == [pygame.Rect(70, 25, 60, 50)]
+    assert screen.get_at((72, 50)) == (50, 50, 50, 255)
+    assert screen.get_at((100, 50)) == (255, 0, 0, 255)
+
+
+def test_text_only_renders_changes(font):
+    cache = hud.GlyphCache()
+    text = hud.Text(font, (5, 5), cache=cache)
+    assert text.update(12)
+    surface = text.surface
+    assert not text.update("12")
+    assert text.surface is surface
+    assert text.rect.topleft == (5, 5)
+
+
+def test_glyph_cache_drops_least_recently_used(font):
+    cache = hud.GlyphCache(size=2)
+    a = cache.render(font, "a", (255, 255, 255))
+    cache.render(font, "b", (255, 255, 255))
+    assert cache.render(font, "a", (255, 255, 255)) is a
+    cache.render(font, "c", (255, 255, 255))
+    assert [key[1] for key in cache.surfaces] == ["a", "c"]
+    assert cache.render(font, "a", (255, 255, 255)) is a
+    assert cache.render(font, "a", (255, 0, 0)) is not a
+    assert len(cache.surfaces) == 2
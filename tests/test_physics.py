@@ -0,0 +1,69 @@
+import random
+from array import array
+
+import pygame
+import pytest
+
+import collision
+import entities
+
+physics = pytest.importorskip("physics")
+
+
+def level():
+    walls = [pygame.Rect(0, 0, 1200, 65), pygame.Rect(0, 760, 1200, 40),
+             pygame.Rect(0, 0, 50, 800), pygame.Rect(1150, 0, 50, 800),
+             pygame.Rect(900, 500, 100, 25), pygame.Rect(300, 300, 40, 40)]
+    world = collision.SpatialHash()
+    for wall in walls:
+        world.insert(wall)
+    return walls, world
+
+
+def crowd(seed, count=500):
+    rng = random.Random(seed)
+    store = entities.EntityStore()
+    for _ in range(count):
+        #some fractional and some negative positions, where truncation matters
+        i = store.add(rng.uniform(-70, 1150), rng.uniform(-70, 760), speed=rng.choice([2, 5, 7.5]))
+        store.vx[i] = rng.choice([-1, 0, 1])
+        store.vy[i] = rng.choice([-1, 0, 1])
+    mult = array("d", (rng.choice([1.0, 1.5]) for _ in range(count)))
+    return store, mult
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_numpy_step_matches_scalar(seed):
+    walls, world = level()
+    scalar, mult = crowd(seed)
+    vectorized, _ = crowd(seed)
+
+    for _ in range(20):
+        collision.slideAll(scalar, mult, world)
+        entities.moveAll(scalar, mult)
+        physics.stepStore(vectorized, mult, physics.wallArray(walls))
+
+    assert vectorized.vx == scalar.vx
+    assert vectorized.vy == scalar.vy
+    assert vectorized.x == scalar.x
+    assert vectorized.y == scalar.y
+
+
+def test_small_pair_budget(monkeypatch):
+    walls, world = level()
+    store, mult = crowd(7, count=50)
+    expected, _ = crowd(7, count=50)
+    monkeypatch.setattr(physics, "PAIR_BUDGET", 8)
+    physics.stepStore(store, mult, physics.wallArray(walls))
+    collision.slideAll(expected, mult, world)
+    entities.moveAll(expected, mult)
+    assert store.x == expected.x and store.y == expected.y
+
+
+def test_no_walls_is_a_plain_move():
+    physics.stepStore(entities.EntityStore(), array("d"), physics.wallArray([]))
+    store, mult = crowd(0, count=20)
+    expected, _ = crowd(0, count=20)
+    physics.stepStore(store, mult, physics.wallArray([]))
+    entities.moveAll(expected, mult)
+    assert store.x == expected.x and store.y == expected.y
@@ -0,0 +1,83 @@
+import json
+
+import pygame
+import pytest
+
+import game
+from profiler import FrameProfiler
+
+
+@pytest.fixture(scope="module")
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((game.WIDTH, game.HEIGHT))
+    pygame.quit()
+
+
+def timedFrame(profiler, *phases):
+    for name in phases:
+        with profiler.phase(name):
+            pass
+    profiler.endFrame()
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = FrameProfiler()
+    timedFrame(profiler, "simulation")
+    assert profiler.frames == 0
+    assert profiler.spanCount == 0
+    assert profiler.names == []
+
+
+def test_toggle_drops_a_half_timed_frame():
+    profiler = FrameProfiler(enabled=True)
+    timedFrame(profiler, "simulation", "blit")
+    profiler.current[0] = 5.0  # timed before the toggle, never ended
+    profiler.toggle()
+    profiler.endFrame()
+    profiler.toggle()
+    timedFrame(profiler, "blit")
+    assert profiler.frames == 2
+    assert profiler.history[0][1] == 0.0
+    assert list(profiler.current) == [0.0, 0.0]
+
+
+def test_trace_events(tmp_path):
+    profiler = FrameProfiler(capacity=2, enabled=True, spansPerFrame=2)
+    for _ in range(5):
+        timedFrame(profiler, "simulation", "blit")
+    path = profiler.dumpTrace(str(tmp_path / "trace.json"))
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    #the span buffer keeps the last capacity * spansPerFrame spans
+    assert [event["name"] for event in events] == ["simulation", "blit"] * 2
+    assert all(event["dur"] >= 0 for event in events)
+
+
+def test_f4_only_dumps_enabled_profiler_with_samples(screen, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    level = game.Game(screen)
+    assert level.dumpTrace() is None
+
+    level.profiler.toggle()
+    assert level.dumpTrace() is None
+
+    level.frame(16, [])
+    path = level.dumpTrace()
+    assert path is not None
+    with open(path) as f:
+        assert json.load(f)["traceEvents"]
+
+
+def test_f4_reports_write_errors(screen, tmp_path, monkeypatch, capsys):
+    #a directory in the way of the trace file, which fails even as root
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(game.time, "time", lambda: 0)
+    (tmp_path / "trace-0.json").mkdir()
+    level = game.Game(screen)
+    level.profiler.toggle()
+    level.frame(16, [])
+
+    event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F4)
+    assert level.frame(16, [event])
+    assert "could not write frame trace" in capsys.readouterr().err
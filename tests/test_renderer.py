@@ -0,0 +1,71 @@
+import pygame
+
+import renderer
+
+GREY = (50, 50, 50)
+
+
+def makeRenderer(size=(200, 100)):
+    screen = pygame.Surface(size)
+    background = pygame.Surface(size)
+    background.fill(GREY)
+    frameRenderer = renderer.Renderer(screen, background)
+    return screen, frameRenderer
+
+
+def square(colour, size=10):
+    image = pygame.Surface((size, size))
+    image.fill(colour)
+    return image
+
+
+def test_first_frame_is_a_full_redraw():
+    screen, frameRenderer = makeRenderer()
+    frameRenderer.blit("a", square((255, 0, 0)), (5, 5))
+    assert frameRenderer.compose() == [screen.get_rect()]
+    assert screen.get_at((6, 6)) == (255, 0, 0, 255)
+
+
+def test_unchanged_frame_is_not_redrawn():
+    screen, frameRenderer = makeRenderer()
+    image = square((255, 0, 0))
+    frameRenderer.blit("a", image, (5, 5))
+    frameRenderer.compose()
+    frameRenderer.blit("a", image, (5, 5))
+    assert frameRenderer.compose() == []
+
+
+def test_overlapping_rects_are_merged():
+    screen, frameRenderer = makeRenderer()
+    image = square((255, 0, 0))
+    frameRenderer.blit("a", image, (10, 10))
+    frameRenderer.blit("far", image, (150, 50))
+    frameRenderer.compose()
+
+    #old and new position overlap, plus a forced rect that touches neither
+    frameRenderer.blit("a", image, (15, 12))
+    frameRenderer.blit("far", image, (150, 50))
+    frameRenderer.markDirty((100, 80, 5, 5))
+    dirty = frameRenderer.compose()
+    assert sorted(map(tuple, dirty)) == [(10, 10, 15, 12), (100, 80, 5, 5)]
+    assert screen.get_at((11, 11)) == GREY + (255,)
+    assert screen.get_at((16, 13)) == (255, 0, 0, 255)
+
+
+def test_chained_overlaps_merge_into_one():
+    screen, frameRenderer = makeRenderer()
+    frameRenderer.compose()
+    for rect in [(0, 0, 10, 10), (20, 0, 10, 10), (8, 0, 14, 5)]:
+        frameRenderer.markDirty(rect)
+    assert frameRenderer.compose() == [pygame.Rect(0, 0, 30, 10)]
+
+
+def test_removed_items_and_offscreen_rects():
+    screen, frameRenderer = makeRenderer()
+    frameRenderer.blit("a", square((255, 0, 0)), (5, 5))
+    frameRenderer.compose()
+    frameRenderer.markDirty((500, 500, 10, 10))
+    frameRenderer.markDirty((195, 95, 10, 10))
+    dirty = frameRenderer.compose()
+    assert sorted(map(tuple, dirty)) == [(5, 5, 10, 10), (195, 95, 5, 5)]
+    assert screen.get_at((6, 6)) == GREY + (255,)
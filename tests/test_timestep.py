@@ -0,0 +1,30 @@
+import pytest
+
+from timestep import FixedTimestep
+
+
+def test_steps_and_alpha():
+    clock = FixedTimestep(step=10, maxSteps=5)
+    assert list(clock.steps(25)) == [0, 10]
+    assert clock.alpha() == pytest.approx(0.5)
+    assert list(clock.steps(4)) == []
+    assert clock.alpha() == pytest.approx(0.9)
+    assert list(clock.steps(1)) == [20]
+    assert clock.alpha() == pytest.approx(0.0)
+
+
+def test_accumulator_carries_fractions():
+    clock = FixedTimestep(step=1000 / 60)
+    count = sum(len(list(clock.steps(1000 / 144))) for _ in range(144))
+    assert count in (59, 60)
+    assert 0 <= clock.alpha() < 1
+    assert clock.time == pytest.approx(count * 1000 / 60)
+
+
+def test_backlog_is_dropped():
+    clock = FixedTimestep(step=10, maxSteps=3)
+    assert len(list(clock.steps(1000))) == 3
+    #nothing left over to catch up on after a long stall
+    assert clock.accumulator == 0
+    assert clock.alpha() == 0
+    assert list(clock.steps(10)) == [30]
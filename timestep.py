@@ -0,0 +1,26 @@
+class FixedTimestep:
+    """Accumulates real frame time and hands it out as fixed simulation steps"""
+
+    def __init__(self, step=1000 / 60, maxSteps=5):
+        self.step = step
+        self.maxSteps = maxSteps
+        self.accumulator = 0
+        self.time = 0
+
+    def steps(self, frameTime):
+        #yields the simulation time (ms) of every step due this frame
+        self.accumulator += frameTime
+        count = int(self.accumulator // self.step)
+        if count > self.maxSteps:
+            #too far behind to catch up, drop the backlog instead of spiralling
+            count = self.maxSteps
+            self.accumulator = count * self.step
+        self.accumulator -= count * self.step
+
+        for _ in range(count):
+            yield self.time
+            self.time += self.step
+
+    def alpha(self):
+        #how far between the last two steps the current frame sits
+        return self.accumulator / self.step